@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""Benchmarks for paradox_mqtt against a simulated panel.
+
+Uses config.py if present, otherwise config_sample.py.  No broker or serial
+port is needed: MQTT publishes are captured by FakeMQTTClient and the panel
+is simulated_panel.SimulatedPanel.
+
+    python benchmark.py keepalive --cycles 10 --depth 3
+    python benchmark.py events --rate 20 --events 500
+"""
+import argparse
+import bisect
+import logging
+import resource
+import sys
+import threading
+import tracemalloc
+from time import monotonic, process_time, sleep
+
+try:
+    import config
+except ImportError:
+    import config_sample as config
+
+    sys.modules["config"] = config
+
+import paho.mqtt.client as mqtt
+
+
+class FakeMQTTClient:
+    """Captures publishes instead of talking to a broker."""
+
+    def __init__(self, *args, **kwargs):
+        self.published = []
+        self.mid = 0
+        self.on_connect = None
+        self.on_publish = None
+        self.on_disconnect = None
+        self.on_message = None
+
+    def publish(self, topic, payload=None, qos=0, retain=False, properties=None):
+        self.published.append((monotonic(), topic, payload, qos, retain))
+        # Acknowledged at once.
+        self.mid += 1
+        if self.on_publish != None:
+            self.on_publish(self, None, self.mid)
+        return mqtt.MQTTMessageInfo(self.mid)
+
+    def connect(self, *args, **kwargs):
+        return mqtt.MQTT_ERR_SUCCESS
+
+    def loop_start(self):
+        # Connected at once, so publishes are not held in the offline buffer.
+        self.on_connect(self, None, {}, 0)
+
+    def __getattr__(self, name):
+        # will_set, subscribe, username_pw_set etc.
+        return lambda *args, **kwargs: None
+
+
+mqtt.Client = FakeMQTTClient
+
+import paradox
+from metrics import Metrics
+from simulated_panel import SimulatedPanel
+
+
+def make_paradox(panel):
+    alarm = paradox.Paradox(connection=panel)
+    alarm.connect_software()
+    return alarm
+
+
+def bench_keep_alive(args):
+    """Time keep alive cycles requesting every status page."""
+    results = {}
+    for depth in sorted({1, args.depth}):
+        panel = SimulatedPanel(
+            response_time=args.response_time, max_outstanding=args.max_outstanding
+        )
+        alarm = make_paradox(panel)
+        alarm.keep_alive_pipeline_depth = depth
+        times = []
+        for i in range(args.cycles):
+            for page in alarm.status_pages.values():
+                page["stale"] = True
+            start = monotonic()
+            alarm.keep_alive()
+            times.append(monotonic() - start)
+        results[depth] = sum(times) / len(times)
+        print(
+            "depth {:d}: {:.3f}s per cycle, {:d} requests, {:d} dropped by panel".format(
+                depth, results[depth], panel.requests, panel.dropped
+            )
+        )
+    if args.depth > 1:
+        print(
+            "cycle time reduction: {:.0%}".format(1 - results[args.depth] / results[1])
+        )
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(percent / 100.0 * (len(values) - 1)))]
+
+
+def zone_open_latencies(alarm, live_events, published):
+    """Seconds from each zone open/close frame being available to the bridge
+    to the publish of the new zone open state."""
+    times = {}
+    for published_time, topic, payload, qos, retain in published:
+        times.setdefault((topic, payload), []).append(published_time)
+    latencies = []
+    for available, event_number, subevent_number, partition_number in live_events:
+        topic = "{}/{}/{}/open".format(
+            paradox.HOMIE_BASE_TOPIC,
+            alarm.homie_device_id,
+            alarm.zone_data[subevent_number]["machine_label"],
+        )
+        topic_times = times.get((topic, "true" if event_number == 1 else "false"), [])
+        i = bisect.bisect_left(topic_times, available)
+        if i < len(topic_times):
+            latencies.append(topic_times[i] - available)
+    return latencies
+
+
+def bench_events(args):
+    """Feed zone open/close live events through main_loop at a fixed rate."""
+    panel = SimulatedPanel(
+        response_time=args.response_time, max_outstanding=args.max_outstanding
+    )
+    alarm = make_paradox(panel)
+    alarm.keep_alive_pipeline_depth = args.depth
+    alarm.metrics.enabled = args.metrics
+    published = alarm.publisher.mqtt.published
+    thread = threading.Thread(target=alarm.main_loop, daemon=True)
+    thread.start()
+    sleep(args.warmup)  # Homie init, first keep alive and label reads
+
+    del published[:]
+    del panel.live_events[:]
+    alarm.metrics = Metrics(enabled=args.metrics)
+    bytes_read = panel.bytes_read
+    if args.tracemalloc:
+        tracemalloc.start()
+    cpu_start = process_time()
+    start = monotonic()
+    for i in range(args.events):
+        wait = start + i / args.rate - monotonic()
+        if wait > 0:
+            sleep(wait)
+        # Zones open on the first pass over them, close on the next, etc.
+        panel.live_event(1 - i // args.zones % 2, i % args.zones + 1)
+    # Wait until every frame is read and publishing has gone quiet.
+    deadline = monotonic() + args.drain
+    while monotonic() < deadline:
+        if not panel.frames and published and monotonic() - published[-1][0] > 0.5:
+            break
+        sleep(0.1)
+    end = published[-1][0] if published else monotonic()
+    cpu = process_time() - cpu_start
+    if args.tracemalloc:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    alarm.stop()
+    thread.join(timeout=5)
+
+    elapsed = end - start
+    frames = (panel.bytes_read - bytes_read) / 37.0
+    latencies = zone_open_latencies(alarm, panel.live_events, published)
+    print(
+        "events: {:d} at {:.1f}/s, processed in {:.2f}s ({:.1f} events/s)".format(
+            args.events, args.rate, elapsed, args.events / elapsed
+        )
+    )
+    print("frames/s: {:.1f}".format(frames / elapsed))
+    if latencies:
+        print(
+            "serial to publish latency ms: p50 {:.1f} p90 {:.1f} p99 {:.1f} max {:.1f} ({:d} matched)".format(
+                percentile(latencies, 50) * 1000,
+                percentile(latencies, 90) * 1000,
+                percentile(latencies, 99) * 1000,
+                max(latencies) * 1000,
+                len(latencies),
+            )
+        )
+    print("publishes per event: {:.2f}".format(len(published) / args.events))
+    print(
+        "cpu time: {:.2f}s ({:.2f}ms per event)".format(cpu, cpu * 1000 / args.events)
+    )
+    print(
+        "peak rss: {:.1f}MB".format(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        )
+    )
+    if args.tracemalloc:
+        print("peak traced python memory: {:.2f}MB".format(traced_peak / 1048576.0))
+    for line in alarm.metrics.summary():
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    keepalive = subparsers.add_parser("keepalive", help=bench_keep_alive.__doc__)
+    keepalive.add_argument("--cycles", type=int, default=5)
+    keepalive.add_argument("--depth", type=int, default=3)
+    keepalive.add_argument("--response-time", type=float, default=0.05)
+    keepalive.add_argument("--max-outstanding", type=int, default=4)
+    keepalive.set_defaults(func=bench_keep_alive)
+
+    events = subparsers.add_parser("events", help=bench_events.__doc__)
+    events.add_argument("--events", type=int, default=200)
+    events.add_argument("--rate", type=float, default=20, help="events per second")
+    events.add_argument("--zones", type=int, default=8)
+    events.add_argument("--depth", type=int, default=1)
+    events.add_argument("--warmup", type=float, default=3)
+    events.add_argument("--drain", type=float, default=60)
+    events.add_argument("--tracemalloc", action="store_true")
+    events.add_argument(
+        "--metrics", action="store_true", help="print per stage timings"
+    )
+    events.add_argument("--response-time", type=float, default=0.05)
+    events.add_argument("--max-outstanding", type=int, default=4)
+    events.set_defaults(func=bench_events)
+
+    args = parser.parse_args()
+    logging.getLogger("paradox_mqtt").setLevel(logging.CRITICAL)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
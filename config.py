@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+import logging
+
+# Default configuration.
+# Do not edit this.  Copy config_sample.py to config.py and edit that.
+
+# Logging
+# LOGGING_LEVEL_CONSOLE = logging.INFO
+# LOGGING_LEVEL_FILE = logging.ERROR
+# LOGGING_FILE=None #or set to file path LOGGING_FILE="/var/log/paradox_mqtt.log"
+
+# Connection Type
+# CONNECTION_TYPE = "Serial"  #Only serial for now
+
+# Serial Connection Details
+# SERIAL_PORT = "/dev/ttyUSB0"
+
+# Gateway (several panels from one process sharing one MQTT connection)
+# PANELS = [
+#     {
+#         "serial_port": "/dev/ttyUSB0",
+#         "homie_device_id": "alarm1",
+#         "homie_device_name": "Alarm 1",
+#         "hass_device_id": "987654321",
+#     },
+#     {"serial_port": "/dev/ttyUSB1", "homie_device_id": "alarm2"},
+# ]
+# GATEWAY_ID = "paradox_gateway"
+
+# Paradox
+# KEEP_ALIVE_SECONDS = 9
+# STATUS_POLL_BACKOFF_FACTOR = 2
+# STATUS_POLL_MAX_SECONDS = 60 # set to KEEP_ALIVE_SECONDS to poll every status page each keep alive
+# KEEP_ALIVE_PIPELINE_DEPTH = 1 # try 3 if your panel tolerates several outstanding requests
+# ZONES = 32
+# USERS = 32
+# OUTPUTS = 16
+# READ_LABELS_SECONDS = 15 * 60
+# LABEL_BLOCK_SECONDS = 1
+# LABEL_CACHE_FILE = "labels_{device_id}.json" # or None to disable
+# OUTPUT_PULSE_SECONDS = 1
+# STATE_SNAPSHOT_FILE = "state_{device_id}.json" # or None to disable
+# STATE_SNAPSHOT_SECONDS = 60
+# STATE_SNAPSHOT_MAX_AGE_SECONDS = 24 * 3600
+# EVENT_JOURNAL_FILE = "events_{device_id}.sqlite" # or None to disable
+# EVENT_JOURNAL_MAX_EVENTS = 100000
+# LIVE_EVENTS_ENABLED = True
+# LIVE_EVENTS_BATCH_MAX = 50
+# LIVE_EVENTS_BATCH_SECONDS = 0.5
+# UPDATE_ALARM_TIME_DIFF_MINUTES = 2 #minimum 2. Lower values will cause constant time updates.
+
+# Metrics
+# METRICS_ENABLED = False
+# METRICS_LOG_SECONDS = 300
+# METRICS_HTTP_PORT = 9470 # Prometheus text format on /metrics
+# METRICS_HTTP_BIND = "127.0.0.1"
+
+# MQTT
+# MQTT_HOST='localhost'
+# MQTT_PORT=1883
+# MQTT_KEEPALIVE=60
+# MQTT user and password below only set if used
+# MQTT_USERNAME = "user"
+# MQTT_PASSWORD = "password"
+
+# HASS
+# Hass device ID should be unique on your HASS setup
+HASS_DEVICE_ID = "987654321"
+
+# Home Assistant (Code requirements)
+# HASS_ALARM_CODE = "0000"  # only set if you are using it
+# HASS_ALARM_CODE_ARM_REQUIRED = False
+# HASS_ALARM_CODE_DISARM_REQUIRED = False
+# HASS_ALARM_CODE_TRIGGER_REQUIRED = False
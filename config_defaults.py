@@ -15,19 +15,78 @@ CONNECTION_TYPE = "Serial"  # Only serial for now
 # Serial Connection Details
 SERIAL_PORT = "/dev/ttyUSB0"
 
+# Gateway
+# List of panels to run from one process sharing one MQTT connection, or None
+# for a single panel configured by SERIAL_PORT, HOMIE_DEVICE_ID etc.
+PANELS = None
+GATEWAY_ID = "paradox_gateway"  # MQTT client id and Homie $state topic
+
 # Paradox
 PANEL_ID = "0000"
 PASSWORD = None
 KEEP_ALIVE_SECONDS = 9
+# Zone and partition status pages are polled less often (doubling up to
+# STATUS_POLL_MAX_SECONDS) while live event reporting works without errors.
+STATUS_POLL_BACKOFF_FACTOR = 2
+STATUS_POLL_MAX_SECONDS = 60
+# Status requests sent before waiting for replies. 1 waits for each reply.
+KEEP_ALIVE_PIPELINE_DEPTH = 1
+# Serial link statistics are published on the panel node this often.
+LINK_STATS_SECONDS = 60
+# panel/messagetime is published at most this often.
+MESSAGETIME_MIN_SECONDS = 30
+# Voltages are averaged over VOLTAGE_AVERAGE_SAMPLES status reads and published
+# when the average moves VOLTAGE_DEADBAND, or a reading moves VOLTAGE_STEP.
+VOLTAGE_AVERAGE_SAMPLES = 4
+VOLTAGE_DEADBAND = 0.2
+VOLTAGE_STEP = 1.0
 ZONES = 32
 USERS = 32
 OUTPUTS = 16
 READ_LABELS_SECONDS = 15 * 60
+LABEL_BLOCK_SECONDS = 1  # one label register block is read per slot
+LABEL_CACHE_FILE = None  # e.g. "/var/lib/paradox_mqtt/labels_{device_id}.json"
 OUTPUT_PULSE_SECONDS = 1
+# Last known state is saved and published at startup until the panel reports.
+STATE_SNAPSHOT_FILE = None  # e.g. "/var/lib/paradox_mqtt/state_{device_id}.json"
+STATE_SNAPSHOT_SECONDS = 60
+STATE_SNAPSHOT_MAX_AGE_SECONDS = 24 * 3600
+STATE_SNAPSHOT_ARM_MAX_AGE_SECONDS = 300  # older arm and alarm state is not restored
+# Live events are written to a SQLite journal, newest EVENT_JOURNAL_MAX_EVENTS kept.
+EVENT_JOURNAL_FILE = None  # e.g. "events_{device_id}.sqlite"
+EVENT_JOURNAL_MAX_EVENTS = 100000
+# Live events are published as JSON arrays on homie/<device>/events/live.
+LIVE_EVENTS_ENABLED = False
+LIVE_EVENTS_BATCH_MAX = 50  # events per message during a burst
+LIVE_EVENTS_BATCH_SECONDS = 0.5  # longest an event is held during a burst
+# Current state as retained JSON on homie/<device>/$json and
+# homie/<device>/<node>/$json, changes coalesced over JSON_STATE_SECONDS.
+JSON_STATE_ENABLED = False
+JSON_STATE_SECONDS = 2
+# Zone open, bypass, alarm, tamper and lowbattery as hex bitmaps (bit 0 is
+# zone 1) on homie/<device>/zonebitmap/<property>, published on change.
+ZONE_BITMAP_ENABLED = False
 UPDATE_ALARM_TIME_DIFF_MINUTES = (
     2  # minimum 2. Lower values will cause constant time updates.
 )
 
+# Metrics
+# Hot path stage timings and counters, logged every METRICS_LOG_SECONDS.
+METRICS_ENABLED = False
+METRICS_LOG_SECONDS = 300
+# Serve metrics in Prometheus text format on http://METRICS_HTTP_BIND:port/metrics
+METRICS_HTTP_PORT = None  # e.g. 9470
+METRICS_HTTP_BIND = "127.0.0.1"
+
+# Diagnostics
+# Thread stacks, tracemalloc diffs and cProfile runs on demand, requested by
+# signal or by publishing to homie/<device>/diagnostics/command/set.
+DIAGNOSTICS_ENABLED = False
+DIAGNOSTICS_DIR = "."  # reports are written here, or None
+DIAGNOSTICS_PUBLISH = True  # reports are published on diagnostics/output
+DIAGNOSTICS_PROFILE_SECONDS = 30
+DIAGNOSTICS_SIGNALS = {"SIGUSR1": "stacks", "SIGUSR2": "profile", "SIGRTMIN": "memory"}
+
 # MQTT
 MQTT_HOST = "localhost"
 MQTT_PORT = 1883
@@ -35,6 +94,18 @@ MQTT_KEEPALIVE = 60
 MQTT_CLIENT_ID = "paradox_mqtt"
 MQTT_USERNAME = None
 MQTT_PASSWORD = None
+# MQTT v5 gives topics published repeatedly a topic alias, and telemetry
+# (voltages, message time, link statistics) a message expiry interval.
+MQTT_V5 = False
+MQTT_TOPIC_ALIASES = True
+MQTT_TELEMETRY_EXPIRY_SECONDS = 300  # or None
+# While disconnected the latest message per retained topic (up to
+# MQTT_OFFLINE_TOPICS_MAX topics) and the last MQTT_OFFLINE_EVENTS_MAX other
+# messages are kept, and sent at MQTT_OFFLINE_FLUSH_RATE per second once
+# reconnected.
+MQTT_OFFLINE_TOPICS_MAX = 10000
+MQTT_OFFLINE_EVENTS_MAX = 1000
+MQTT_OFFLINE_FLUSH_RATE = 100
 
 # Homie Standard Items
 # https://homieiot.github.io/specification/spec-core-v4_0_0/
@@ -47,6 +118,18 @@ HOMIE_DEVICE_EXTENSIONS = ""
 HOMIE_INIT_SECONDS = 3600 * 24  # Daily
 HOMIE_MQTT_QOS = 1
 HOMIE_MQTT_RETAIN = True
+# QoS and retain per property class, None for HOMIE_MQTT_QOS/HOMIE_MQTT_RETAIN.
+# alarm: partition, output and trouble state, panel alarm and bell, live events
+# zone: zone state, last zone event and zone bitmaps
+# telemetry: voltages, panel and message time, link statistics
+# metadata: Homie attributes, Home Assistant discovery, other panel details
+HOMIE_MQTT_CLASS_QOS = {"alarm": None, "zone": None, "telemetry": 0, "metadata": None}
+HOMIE_MQTT_CLASS_RETAIN = {
+    "alarm": None,
+    "zone": None,
+    "telemetry": None,
+    "metadata": None,
+}
 HOMIE_PUBLISH_ALL_SECONDS = 60
 HOMIE_IMPLEMENTATION = "paradox_mqtt"
 
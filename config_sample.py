@@ -15,15 +15,65 @@ import logging
 # Serial Connection Details
 # SERIAL_PORT = "/dev/ttyUSB0"
 
+# Gateway (several panels from one process sharing one MQTT connection)
+# PANELS = [
+#     {
+#         "serial_port": "/dev/ttyUSB0",
+#         "homie_device_id": "alarm1",
+#         "homie_device_name": "Alarm 1",
+#         "hass_device_id": "987654321",
+#     },
+#     {"serial_port": "/dev/ttyUSB1", "homie_device_id": "alarm2"},
+# ]
+# GATEWAY_ID = "paradox_gateway"
+
 # Paradox
 # KEEP_ALIVE_SECONDS = 9
+# STATUS_POLL_BACKOFF_FACTOR = 2
+# STATUS_POLL_MAX_SECONDS = 60 # set to KEEP_ALIVE_SECONDS to poll every status page each keep alive
+# KEEP_ALIVE_PIPELINE_DEPTH = 1 # try 3 if your panel tolerates several outstanding requests
+# LINK_STATS_SECONDS = 60
+# MESSAGETIME_MIN_SECONDS = 30 # 0 publishes every message time
+# VOLTAGE_AVERAGE_SAMPLES = 4
+# VOLTAGE_DEADBAND = 0.2 # 0 publishes every voltage read
+# VOLTAGE_STEP = 1.0
 # ZONES = 32
 # USERS = 32
 # OUTPUTS = 16
 # READ_LABELS_SECONDS = 15 * 60
+# LABEL_BLOCK_SECONDS = 1
+# Label cache and state snapshot, relative paths are resolved against the
+# working directory so use a directory the service can write to, or None
+# to disable.
+LABEL_CACHE_FILE = "/var/lib/paradox_mqtt/labels_{device_id}.json"
 # OUTPUT_PULSE_SECONDS = 1
+STATE_SNAPSHOT_FILE = "/var/lib/paradox_mqtt/state_{device_id}.json"
+# STATE_SNAPSHOT_SECONDS = 60
+# STATE_SNAPSHOT_MAX_AGE_SECONDS = 24 * 3600
+# STATE_SNAPSHOT_ARM_MAX_AGE_SECONDS = 300 # older arm and alarm state is not restored
+# EVENT_JOURNAL_FILE = "events_{device_id}.sqlite" # or None to disable
+# EVENT_JOURNAL_MAX_EVENTS = 100000
+# LIVE_EVENTS_ENABLED = False
+# LIVE_EVENTS_BATCH_MAX = 50
+# LIVE_EVENTS_BATCH_SECONDS = 0.5
+# JSON_STATE_ENABLED = False
+# JSON_STATE_SECONDS = 2
+# ZONE_BITMAP_ENABLED = False
 # UPDATE_ALARM_TIME_DIFF_MINUTES = 2 #minimum 2. Lower values will cause constant time updates.
 
+# Metrics
+# METRICS_ENABLED = False
+# METRICS_LOG_SECONDS = 300
+# METRICS_HTTP_PORT = 9470 # Prometheus text format on /metrics
+# METRICS_HTTP_BIND = "127.0.0.1"
+
+# Diagnostics
+# DIAGNOSTICS_ENABLED = False
+# DIAGNOSTICS_DIR = "." # or None
+# DIAGNOSTICS_PUBLISH = True
+# DIAGNOSTICS_PROFILE_SECONDS = 30
+# DIAGNOSTICS_SIGNALS = {"SIGUSR1": "stacks", "SIGUSR2": "profile", "SIGRTMIN": "memory"}
+
 # MQTT
 # MQTT_HOST='localhost'
 # MQTT_PORT=1883
@@ -31,6 +81,15 @@ import logging
 # MQTT user and password below only set if used
 # MQTT_USERNAME = "user"
 # MQTT_PASSWORD = "password"
+# MQTT_V5 = False
+# MQTT_TOPIC_ALIASES = True
+# MQTT_TELEMETRY_EXPIRY_SECONDS = 300 # or None
+# MQTT_OFFLINE_TOPICS_MAX = 10000
+# MQTT_OFFLINE_EVENTS_MAX = 1000
+# MQTT_OFFLINE_FLUSH_RATE = 100 # buffered messages per second after reconnecting
+# QoS and retain per property class (None uses HOMIE_MQTT_QOS/HOMIE_MQTT_RETAIN)
+# HOMIE_MQTT_CLASS_QOS = {"alarm": None, "zone": None, "telemetry": 0, "metadata": None}
+# HOMIE_MQTT_CLASS_RETAIN = {"alarm": None, "zone": None, "telemetry": None, "metadata": None}
 
 # HASS
 # Hass device ID should be unique on your HASS setup
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+from collections import deque
+
+
+class DeadbandFilter:
+    def __init__(self, deadband=0.2, samples=4, step=1.0, digits=1):
+        """Initialise DeadbandFilter.
+
+        Readings are averaged over the last samples and a new value is only
+        reported once the average moves deadband or more from the last one
+        reported.  A reading step or more from the last reported value starts
+        the average again from that reading and is reported at once.
+        """
+        self.deadband = deadband
+        self.step = step
+        self.digits = digits
+        self.readings = deque(maxlen=max(1, samples))
+        self.value = None
+
+    def update(self, reading):
+        """Add reading and return the value to report, or None if unchanged."""
+        if self.value != None and abs(reading - self.value) >= self.step:
+            self.readings.clear()
+            self.readings.append(reading)
+            self.value = reading
+            return reading
+        self.readings.append(reading)
+        average = round(sum(self.readings) / len(self.readings), self.digits)
+        if (
+            self.value == None
+            or round(abs(average - self.value), self.digits) >= self.deadband
+        ):
+            self.value = average
+            return average
+        return None
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+import cProfile
+import io
+import logging
+import os
+import pstats
+import queue
+import sys
+import threading
+import traceback
+import tracemalloc
+from datetime import datetime
+from time import monotonic
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+COMMANDS = ("stacks", "memory", "profile")
+
+
+class Diagnostics:
+    def __init__(
+        self,
+        name,
+        directory=None,
+        publish=None,
+        wakeup=None,
+        profile_seconds=30,
+        top=40,
+    ):
+        """Initialise Diagnostics.
+
+        Commands are queued by request, which is safe to call from a signal
+        handler or the MQTT thread, and handled by a worker thread.  Only
+        starting and stopping the profiler happens in the main loop (poll), as
+        cProfile profiles the thread that enables it.  With several main loops
+        (a gateway) the first to poll profiles its own; profiling and memory
+        tracing are process wide, so use one Diagnostics per process.  Reports
+        are written to directory and/or passed to publish.
+        """
+        logger.debug("Initialising Diagnostics...")
+        self.name = name
+        self.directory = directory
+        self.publish = publish
+        self.wakeup = wakeup
+        self.profile_seconds = profile_seconds
+        self.top = top
+        self.requests = queue.SimpleQueue()
+        self.profile_request = None  # seconds to profile for, set by the worker
+        self.lock = threading.Lock()  # guards the profiler between main loops
+        self.profiler = None
+        self.profile_thread = None
+        self.profile_until = None
+        self.snapshot = None
+        self.thread = threading.Thread(
+            target=self.worker, name="diagnostics", daemon=True
+        )
+        self.thread.start()
+        logger.debug("Initialised Diagnostics.")
+
+    def request(self, command):
+        """Queue a command: "stacks", "memory", "memory stop" or "profile [seconds]"."""
+        self.requests.put(command)
+
+    def worker(self):
+        while True:
+            command = self.requests.get()
+            try:
+                if isinstance(command, tuple):
+                    self.report_profile(*command)
+                else:
+                    self.run_command(command)
+            except Exception as e:
+                logger.error("Diagnostics {} failed: {}".format(command, e))
+
+    def run_command(self, command):
+        words = command.strip().lower().split()
+        if not words or words[0] not in COMMANDS:
+            logger.error("Unknown diagnostics command {}.".format(command))
+            return
+        logger.info("Running diagnostics {}.".format(command))
+        if words[0] == "stacks":
+            self.report("stacks", self.thread_stacks())
+        elif words[0] == "memory":
+            if words[1:] == ["stop"]:
+                tracemalloc.stop()
+                self.snapshot = None
+                self.report("memory", "Memory tracing stopped.")
+            else:
+                self.report("memory", self.memory_diff())
+        else:
+            seconds = float(words[1]) if len(words) > 1 else self.profile_seconds
+            self.profile_request = seconds
+            if self.wakeup != None:
+                self.wakeup()
+
+    def poll(self):
+        """Start or stop a requested profile.  Called from the main loop."""
+        thread = threading.current_thread()
+        with self.lock:
+            if self.profiler != None:
+                if thread.ident == self.profile_thread and (
+                    monotonic() >= self.profile_until
+                ):
+                    self.profiler.disable()
+                    self.requests.put((self.profiler, thread.name))
+                    self.profiler = None
+            elif self.profile_request != None:
+                seconds, self.profile_request = self.profile_request, None
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError as e:
+                    # Another profiler is active
+                    logger.error("Could not start profiling: {}".format(e))
+                    return
+                self.profiler = profiler
+                self.profile_thread = thread.ident
+                self.profile_until = monotonic() + seconds
+
+    def thread_stacks(self):
+        frames = sys._current_frames()
+        lines = []
+        for thread in threading.enumerate():
+            lines.append(
+                "Thread {} (ident {}, daemon {}):".format(
+                    thread.name, thread.ident, thread.daemon
+                )
+            )
+            frame = frames.get(thread.ident)
+            if frame != None:
+                lines.extend(line.rstrip() for line in traceback.format_stack(frame))
+            lines.append("")
+        return "\n".join(lines)
+
+    def memory_diff(self):
+        """Compare a new tracemalloc snapshot with the previous one.
+
+        The first call starts tracing, so only allocations made after it are
+        seen.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.snapshot = None
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            "Traced memory: {:.1f} KiB, peak {:.1f} KiB.".format(
+                current / 1024, peak / 1024
+            )
+        ]
+        if self.snapshot == None:
+            lines.append("Tracing started, baseline snapshot taken.")
+        else:
+            lines.append("Largest changes since the previous snapshot:")
+            for stat in snapshot.compare_to(self.snapshot, "lineno")[: self.top]:
+                lines.append(str(stat))
+        self.snapshot = snapshot
+        return "\n".join(lines)
+
+    def report_profile(self, profiler, thread_name):
+        if self.directory != None:
+            profiler.dump_stats(self.filename("profile", "prof"))
+        stream = io.StringIO()
+        stream.write("Thread {}:\n".format(thread_name))
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        self.report("profile", stream.getvalue())
+
+    def filename(self, kind, extension="txt"):
+        return os.path.join(
+            self.directory,
+            "diagnostics_{}_{}_{}.{}".format(
+                self.name, kind, datetime.now().strftime("%Y%m%d-%H%M%S"), extension
+            ),
+        )
+
+    def report(self, kind, text):
+        if self.directory != None:
+            filename = self.filename(kind)
+            with open(filename, "w") as f:
+                f.write(text)
+            logger.info("Diagnostics {} written to {}.".format(kind, filename))
+        if self.publish != None:
+            self.publish("{}\n{}".format(kind, text))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import logging
+
+from paradox_map import get_map, load_map_file
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+
+def handler_key(event_number, subevent_number):
+    return event_number * 256 + subevent_number
+
+
+def number_range(value, default):
+    """Return (first, last) for a number, [first, last] pair or None."""
+    if value == None:
+        return default
+    if isinstance(value, int):
+        return value, value
+    return value[0], value[1]
+
+
+def compile_handlers(model):
+    """Compile the live event handlers of model and any model it extends.
+
+    Returns (arm_states, handlers).  arm_states maps an arm state name to a
+    tuple of (partition property, value) transitions.  handlers maps
+    handler_key(event, subevent) to a tuple of (action, params) run in file
+    order.  An entry with "replace": true drops the actions an extended model
+    set for the same events first; actions from earlier entries of the same
+    file are kept.
+    """
+    data = load_map_file(model, "handlers")
+    if "extends" in data:
+        arm_states, handlers = compile_handlers(data["extends"])
+        arm_states = dict(arm_states)
+        handlers = {key: list(actions) for key, actions in handlers.items()}
+    else:
+        arm_states, handlers = {}, {}
+    inherited = set(handlers)  # keys whose actions came from the extended model
+    for name, properties in data.get("arm_states", {}).items():
+        arm_states[name] = tuple(properties.items())
+    for entry in data.get("events", []):
+        params = {
+            key: value
+            for key, value in entry.items()
+            if key not in ("event", "subevent", "action", "replace", "comment")
+        }
+        if entry["action"] == "partition":
+            params["properties"] = tuple(params["properties"].items())
+        first_event, last_event = number_range(entry["event"], None)
+        first_subevent, last_subevent = number_range(entry.get("subevent"), (0, 255))
+        for event_number in range(first_event, last_event + 1):
+            for subevent_number in range(first_subevent, last_subevent + 1):
+                key = handler_key(event_number, subevent_number)
+                if entry.get("replace", False) and key in inherited:
+                    inherited.discard(key)
+                    handlers[key] = []
+                elif key not in handlers:
+                    handlers[key] = []
+                handlers[key].append((entry["action"], params))
+    return arm_states, {key: tuple(actions) for key, actions in handlers.items()}
+
+
+def get_handlers(model):
+    """Return the compiled (arm_states, handlers) of model, loading on first use."""
+    return get_map(model, "handlers", compile_handlers)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+import logging
+import queue
+import sqlite3
+import threading
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY,
+        host_time TEXT NOT NULL,
+        panel_time TEXT,
+        event INTEGER NOT NULL,
+        subevent INTEGER NOT NULL,
+        partition INTEGER,
+        zone INTEGER,
+        label_type INTEGER,
+        label TEXT,
+        event_description TEXT,
+        subevent_description TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS events_host_time ON events (host_time)",
+    "CREATE INDEX IF NOT EXISTS events_zone ON events (zone, host_time)",
+    "CREATE INDEX IF NOT EXISTS events_partition ON events (partition, host_time)",
+)
+
+INSERT = """INSERT INTO events (host_time, panel_time, event, subevent, partition,
+    zone, label_type, label, event_description, subevent_description)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+BATCH_SIZE = 500
+
+
+class EventJournal:
+    def __init__(self, filename, max_events=100000):
+        """Initialise EventJournal.
+
+        Events are queued by append and written by a background thread, one
+        transaction per batch.  Only the newest max_events rows are kept.
+        """
+        logger.debug("Initialising EventJournal...")
+        self.filename = filename
+        self.max_events = max_events
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(
+            target=self.writer, name="event_journal", daemon=True
+        )
+        self.thread.start()
+        logger.debug("Initialised EventJournal.")
+
+    def append(
+        self,
+        host_time,
+        panel_time,
+        event,
+        subevent,
+        partition,
+        zone,
+        label_type,
+        label,
+        event_description,
+        subevent_description,
+    ):
+        """Queue an event for writing.  Never blocks on the database."""
+        self.queue.put(
+            (
+                host_time,
+                panel_time,
+                event,
+                subevent,
+                partition,
+                zone,
+                label_type,
+                label,
+                event_description,
+                subevent_description,
+            )
+        )
+
+    def stop(self):
+        """Write the queued events and stop the writer thread."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def open(self):
+        connection = sqlite3.connect(self.filename)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        return connection
+
+    def writer(self):
+        try:
+            connection = self.open()
+        except Exception as e:
+            logger.error("Could not open event journal {}: {}".format(self.filename, e))
+            return
+        logger.info("Writing events to {}.".format(self.filename))
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [row for row in batch if row != None]
+            if not batch:
+                continue
+            try:
+                with connection:
+                    connection.executemany(INSERT, batch)
+                    connection.execute(
+                        "DELETE FROM events WHERE id <= (SELECT max(id) FROM events) - ?",
+                        (self.max_events,),
+                    )
+            except Exception as e:
+                logger.error(
+                    "Could not write {:d} events to journal: {}".format(len(batch), e)
+                )
+        connection.close()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+import logging
+import threading
+
+from config_defaults import *
+from config import *
+
+import paradox
+import serial_connection
+from diagnostics import Diagnostics
+from mqtt_publisher import MQTTPublisher
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+
+class Gateway:
+    def __init__(self, panels, started=None):
+        """Initialise Gateway.
+
+        Runs one Paradox per entry of panels (see PANELS in config_sample.py),
+        all sharing a single MQTT connection.
+        """
+        logger.debug("Initialising Gateway...")
+        self.publisher = MQTTPublisher(
+            state_topic="{}/{}/{}".format(HOMIE_BASE_TOPIC, GATEWAY_ID, "$state"),
+            gateway=True,
+            client_id=GATEWAY_ID,
+        )
+        # Shared by every panel, reports are published on each of them.
+        self.diagnostics = None
+        if DIAGNOSTICS_ENABLED:
+            self.diagnostics = Diagnostics(
+                GATEWAY_ID,
+                directory=DIAGNOSTICS_DIR,
+                publish=self.publish_diagnostics if DIAGNOSTICS_PUBLISH else None,
+                wakeup=self.wakeup_diagnostics,
+                profile_seconds=DIAGNOSTICS_PROFILE_SECONDS,
+            )
+        self.panels = []
+        for panel in panels:
+            connection = serial_connection.Serial_Connection(port=panel["serial_port"])
+            self.panels.append(
+                paradox.Paradox(
+                    connection=connection,
+                    started=started,
+                    publisher=self.publisher,
+                    homie_device_id=panel["homie_device_id"],
+                    homie_device_name=panel.get(
+                        "homie_device_name", panel["homie_device_id"]
+                    ),
+                    hass_device_id=panel.get(
+                        "hass_device_id", HASS_DEVICE_ID + panel["homie_device_id"]
+                    ),
+                    diagnostics=self.diagnostics,
+                )
+            )
+        logger.debug("Initialised Gateway.")
+
+    def main_loop(self):
+        """Run the main loop of every panel in its own thread until they stop."""
+        self.publisher.connect(
+            host=MQTT_HOST,
+            port=MQTT_PORT,
+            username=MQTT_USERNAME,
+            password=MQTT_PASSWORD,
+        )
+        threads = []
+        for panel in self.panels:
+            thread = threading.Thread(
+                target=panel.main_loop, name=panel.homie_device_id, daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            # Let every panel finish its main loop, and so its journal.
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+    def stop(self):
+        for panel in self.panels:
+            panel.stop()
+
+    def publish_diagnostics(self, text):
+        for panel in self.panels:
+            panel.homie_publish_diagnostics(text)
+
+    def wakeup_diagnostics(self):
+        for panel in self.panels:
+            panel.scheduler.trigger("diagnostics")
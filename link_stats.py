@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+import logging
+from time import monotonic
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+# Request type by the first byte of a request sent to the panel.
+COMMAND_TYPES = {
+    0x00: "initialize",
+    0x30: "settime",
+    0x40: "action",
+    0x50: "read",
+    0x5F: "start",
+    0x72: "initiate",
+}
+
+
+def command_type(message):
+    """Request type of message for the reply timeout counts."""
+    if message[0] == 0x50 and message[2] == 0x80:
+        return "status"
+    return COMMAND_TYPES.get(message[0], "0x{:02x}".format(message[0]))
+
+
+class LinkStats:
+    def __init__(self, baudrate=9600):
+        """Initialise LinkStats.
+
+        Counts are totals since startup.  Frame rate and line utilisation are
+        over the window since the previous sample.
+        """
+        self.baudrate = baudrate
+        self.frames = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.checksum_failures = 0
+        self.bytes_discarded = 0
+        self.retries = 0
+        self.reply_timeouts = {}  # command type: count
+        self.window_start = monotonic()
+        self.window_frames = 0
+        self.window_bytes_received = 0
+        self.window_bytes_sent = 0
+
+    def received(self, message):
+        self.frames += 1
+        self.bytes_received += len(message)
+
+    def sent(self, message):
+        self.bytes_sent += len(message)
+
+    def reply_timeout(self, message):
+        command = command_type(message)
+        self.reply_timeouts[command] = self.reply_timeouts.get(command, 0) + 1
+
+    def sample(self):
+        """Return (frames per second, line utilisation %) since the last sample.
+
+        Utilisation is of the busier direction, at 10 bits per byte.
+        """
+        now = monotonic()
+        seconds = now - self.window_start
+        frames = self.frames - self.window_frames
+        received = self.bytes_received - self.window_bytes_received
+        sent = self.bytes_sent - self.window_bytes_sent
+        self.window_start = now
+        self.window_frames = self.frames
+        self.window_bytes_received = self.bytes_received
+        self.window_bytes_sent = self.bytes_sent
+        if seconds <= 0:
+            return None, None
+        utilisation = max(received, sent) * 10 * 100 / (self.baudrate * seconds)
+        return round(frames / seconds, 2), round(utilisation, 1)
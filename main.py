@@ -1,5 +1,13 @@
 #!/usr/bin/env python
+import atexit
 import logging
+import logging.handlers
+import queue
+import signal
+from time import monotonic
+
+started = monotonic()
+
 from config_defaults import *
 from config import *
 
@@ -8,38 +16,79 @@ logger = logging.getLogger("paradox_mqtt")
 logger.setLevel(LOGGING_LEVEL_CONSOLE)
 
 # create formatter and add it to the handlers
-formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+if PANELS == None:
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+else:
+    formatter = logging.Formatter(
+        "%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s"
+    )
 
 # create file handler which logs even debug messages
+handlers = []
 if LOGGING_FILE != None:
     fh = logging.FileHandler(LOGGING_FILE)
     fh.setLevel(LOGGING_LEVEL_FILE)
     fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    handlers.append(fh)
 
 # create console handler with a higher log level
 ch = logging.StreamHandler()
 ch.setLevel(LOGGING_LEVEL_CONSOLE)
 ch.setFormatter(formatter)
-logger.addHandler(ch)
+handlers.append(ch)
+
+# Records are queued and written by a listener thread so a slow disk or
+# console does not hold up the serial loop.
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(
+    log_queue, *handlers, respect_handler_level=True
+)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 import paradox
 import serial_connection
-import time
-
-logger.info("Estasblishing serial connection...")
-connected = False
-while not connected:
-    try:
-        connection = serial_connection.Serial_Connection(port=SERIAL_PORT)
-        connection.connect()
-        connected = True
-    except:
-        logger.error("Could not connect to serial port.")
-        time.sleep(5)
-        pass
-logger.info("Connected to serial port.")
-paradox = paradox.Paradox(connection=connection)
-logger.info("Connected to alarm.")
+import gateway
+import metrics
+
+# MQTT connects in the background while the main loop opens the serial port
+# and sets up the panel session.
+if PANELS == None:
+    connection = serial_connection.Serial_Connection(port=SERIAL_PORT)
+    paradox = paradox.Paradox(connection=connection, started=started)
+else:
+    paradox = gateway.Gateway(panels=PANELS, started=started)
+
+if METRICS_HTTP_PORT != None:
+    metrics_server = metrics.MetricsServer(METRICS_HTTP_PORT, METRICS_HTTP_BIND)
+    for panel in paradox.panels if PANELS != None else [paradox]:
+        metrics_server.add(panel.homie_device_id, panel.metrics)
+    metrics_server.start()
+
+if DIAGNOSTICS_ENABLED:
+
+    def request_diagnostics(command):
+        # Only queues the request, the work is done by the diagnostics thread.
+        def handler(signum, frame):
+            paradox.diagnostics.request(command)
+
+        return handler
+
+    for name, command in DIAGNOSTICS_SIGNALS.items():
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), request_diagnostics(command))
+
+# Stopping ends the main loop, which writes the queued journal events.
+def stop(signum, frame):
+    logger.info("Stopping main loop.")
+    paradox.stop()
+
+
+signal.signal(signal.SIGTERM, stop)
+
+logger.info("Starting main loop.")
 
 paradox.main_loop()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+import bisect
+import http.server
+import logging
+import threading
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+# Upper bounds in seconds of the stage timing histogram buckets.
+STAGE_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+# Prometheus label name of counters that have a label.
+COUNTER_LABELS = {
+    "frames": "type",
+    "publishes": "class",
+    "reply_timeouts": "command",
+}
+
+COUNTER_HELP = {
+    "frames": "Valid frames received from the panel by message type.",
+    "checksum_failures": "Frames dropped for a bad checksum.",
+    "input_buffer_flushes": "Serial input buffer flushes.",
+    "bytes_discarded": "Bytes dropped by input buffer flushes and bad frames.",
+    "reply_timeouts": "Requests that got no reply in time by request type.",
+    "retries": "Requests sent again after a reply timeout.",
+    "publishes": "MQTT publishes by topic class.",
+}
+
+
+class Histogram:
+    def __init__(self, buckets=STAGE_BUCKETS):
+        """Initialise Histogram with fixed bucket upper bounds (plus +Inf)."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding quantile q (None if empty)."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        total = 0
+        for i, count in enumerate(self.counts):
+            total += count
+            if total >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class Metrics:
+    def __init__(self, enabled=False):
+        """Initialise Metrics.
+
+        Callers check enabled before timing anything so disabled metrics cost
+        one attribute test per stage.
+        """
+        self.enabled = enabled
+        self.counters = {}  # (name, label): count
+        self.histograms = {}  # name: Histogram
+        self.gauges = {}  # name: (help, function returning the value or None)
+        # Running total of the publish stage, subtracted from the update stage
+        # that encloses it so no time is counted twice.
+        self.publish_seconds = 0.0
+
+    def inc(self, name, label=None, value=1):
+        key = (name, label)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram == None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def gauge(self, name, help, function):
+        """Export the value of function() as gauge name when scraped."""
+        self.gauges[name] = (help, function)
+
+    def summary(self):
+        """Lines describing every stage histogram and counter."""
+        lines = []
+        for name in sorted(self.histograms):
+            histogram = self.histograms[name]
+            lines.append(
+                "{}: {:d} in {:.3f}s, mean {:.3f}ms, p50 <= {:.3f}ms, p99 <= {:.3f}ms".format(
+                    name,
+                    histogram.count,
+                    histogram.sum,
+                    histogram.sum * 1000 / histogram.count,
+                    histogram.quantile(0.5) * 1000,
+                    histogram.quantile(0.99) * 1000,
+                )
+            )
+        for name, label in sorted(self.counters, key=str):
+            lines.append(
+                "{}{}: {:d}".format(
+                    name,
+                    "" if label == None else "[{}]".format(label),
+                    self.counters[(name, label)],
+                )
+            )
+        return lines
+
+    def log_summary(self):
+        for line in self.summary():
+            logger.info(line)
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(devices):
+    """Render {device id: Metrics} in the Prometheus text exposition format."""
+    counters = {}  # name: [(device, label, value)]
+    histograms = []  # (device, stage, Histogram)
+    gauges = {}  # name: (help, [(device, value)])
+    for device, metrics in sorted(devices.items()):
+        for (name, label), value in list(metrics.counters.items()):
+            counters.setdefault(name, []).append((device, label, value))
+        for stage, histogram in list(metrics.histograms.items()):
+            histograms.append((device, stage, histogram))
+        for name, (help, function) in list(metrics.gauges.items()):
+            try:
+                value = function()
+            except Exception as e:
+                logger.debug("Gauge %s failed: %s", name, e)
+                value = None
+            if value != None:
+                gauges.setdefault(name, (help, []))[1].append((device, value))
+
+    lines = []
+    for name in sorted(counters):
+        metric = "paradox_{}_total".format(name)
+        lines.append("# HELP {} {}".format(metric, COUNTER_HELP.get(name, name)))
+        lines.append("# TYPE {} counter".format(metric))
+        for device, label, value in counters[name]:
+            labels = 'device="{}"'.format(escape_label(device))
+            if label != None:
+                labels += ',{}="{}"'.format(
+                    COUNTER_LABELS.get(name, "label"), escape_label(label)
+                )
+            lines.append("{}{{{}}} {}".format(metric, labels, value))
+    if histograms:
+        metric = "paradox_stage_seconds"
+        lines.append("# HELP {} Time spent per hot path stage.".format(metric))
+        lines.append("# TYPE {} histogram".format(metric))
+        for device, stage, histogram in histograms:
+            labels = 'device="{}",stage="{}"'.format(
+                escape_label(device), escape_label(stage)
+            )
+            # Copied so the buckets add up while the main loop observes.
+            counts = list(histogram.counts)
+            total = 0
+            for bound, count in zip(histogram.buckets, counts):
+                total += count
+                lines.append(
+                    '{}_bucket{{{},le="{}"}} {}'.format(metric, labels, bound, total)
+                )
+            total += counts[-1]
+            lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(metric, labels, total))
+            lines.append("{}_sum{{{}}} {}".format(metric, labels, histogram.sum))
+            lines.append("{}_count{{{}}} {}".format(metric, labels, total))
+    for name in sorted(gauges):
+        help, values = gauges[name]
+        metric = "paradox_{}".format(name)
+        lines.append("# HELP {} {}".format(metric, help))
+        lines.append("# TYPE {} gauge".format(metric))
+        for device, value in values:
+            lines.append(
+                '{}{{device="{}"}} {}'.format(metric, escape_label(device), value)
+            )
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, port, bind_address="127.0.0.1"):
+        """Initialise MetricsServer.
+
+        Serves GET /metrics from a daemon thread; rendering reads the metrics
+        of each device without blocking their main loops.
+        """
+        logger.debug("Initialising MetricsServer...")
+        self.devices = {}  # device id: Metrics
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = prometheus_text(server.devices).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        self.httpd = http.server.ThreadingHTTPServer((bind_address, port), Handler)
+        self.httpd.daemon_threads = True
+        logger.debug("Initialised MetricsServer.")
+
+    def add(self, device_id, metrics):
+        self.devices[device_id] = metrics
+
+    def start(self):
+        logger.info(
+            "Serving metrics on http://{}:{}/metrics".format(
+                *self.httpd.server_address[:2]
+            )
+        )
+        thread = threading.Thread(
+            target=self.httpd.serve_forever, name="metrics", daemon=True
+        )
+        thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
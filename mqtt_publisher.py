@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+import logging
+import threading
+from collections import OrderedDict, deque
+from time import monotonic, sleep
+import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+
+from config_defaults import *
+from config import *
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+
+class MQTTPublisher:
+    def __init__(self, state_topic, gateway=False, client_id=MQTT_CLIENT_ID):
+        """Initialise MQTTPublisher.
+
+        One MQTT connection shared by every panel in the process.  state_topic
+        is set to "lost" by the broker if the connection drops.  In gateway
+        mode the publisher sets it to "ready" itself once connected, otherwise
+        it is the $state topic of the only panel.
+
+        With MQTT_V5 topics published again at QoS 0 on a connection are given
+        topic aliases, up to the broker's Topic Alias Maximum, and publishes
+        with an expiry get a message expiry interval.
+
+        While disconnected publishes are held in a bounded offline buffer:
+        the latest message of each retained topic and a capped FIFO of the
+        others.  After reconnecting it is flushed at MQTT_OFFLINE_FLUSH_RATE,
+        what was published before the first connection at once.
+        """
+        logger.debug("Initialising MQTTPublisher...")
+        self.state_topic = state_topic
+        self.gateway = gateway
+        self.devices = {}  # Homie device id: Paradox
+        self.v5 = MQTT_V5
+        self.mqtt = mqtt.Client(
+            client_id=client_id, protocol=mqtt.MQTTv5 if self.v5 else mqtt.MQTTv311
+        )
+
+        self.lock = threading.Lock()
+        self.connected = False
+        self.was_connected = False
+
+        # Offline buffer, (topic, message, qos, retain, expiry, time) tuples
+        self.offline_retained = OrderedDict()  # topic: publish
+        self.offline_events = deque(maxlen=MQTT_OFFLINE_EVENTS_MAX)
+        self.offline_dropped = 0
+        self.flushing = False
+
+        # Topic aliases of the current connection
+        self.topic_alias_maximum = 0
+        self.topic_aliases = {}  # topic: alias
+        self.topics_published = set()
+        self.alias_bytes_saved = 0
+
+        # QoS > 0 publishes awaiting acknowledgement.  on_publish runs with
+        # the client's own lock held, so it only queues the message ids and
+        # they are settled under self.lock.
+        self.unacknowledged = set()  # message ids
+        self.acknowledged = deque()  # message ids from on_publish
+        self.mqtt.on_connect = self.on_mqtt_connect
+        self.mqtt.on_publish = self.on_mqtt_publish
+        self.mqtt.on_disconnect = self.on_mqtt_disconnect
+        self.mqtt.on_message = self.on_mqtt_message
+
+        # MQTT Will
+        self.mqtt.will_set(
+            state_topic, payload="lost", qos=HOMIE_MQTT_QOS, retain=HOMIE_MQTT_RETAIN
+        )
+        logger.debug("Initialised MQTTPublisher.")
+
+    def add_device(self, device_id, device):
+        """Route callbacks and messages for Homie device_id to device."""
+        self.devices[device_id] = device
+
+    def on_mqtt_connect(self, client, userdata, flags, rc, properties=None):
+        if rc == 0:
+            if self.v5:
+                self.reset_topic_aliases(properties)
+            with self.lock:
+                self.connected = True
+                # Startup publishes are not held back by the flush rate.
+                throttle, self.was_connected = self.was_connected, True
+                if self.buffered() and not self.flushing:
+                    self.flushing = True
+                    threading.Thread(
+                        target=self.flush_offline,
+                        args=(throttle,),
+                        name="mqtt_flush",
+                        daemon=True,
+                    ).start()
+        if rc == 0 and self.gateway:
+            self.publish(self.state_topic, "ready")
+        for device in list(self.devices.values()):
+            device.on_mqtt_connect(client, userdata, flags, rc)
+
+    def on_mqtt_disconnect(self, client, userdata, rc, properties=None):
+        logger.info("MQTT was disconnected with return code of {}".format(rc))
+        with self.lock:
+            self.connected = False
+
+    def on_mqtt_publish(self, client, userdata, mid):
+        self.acknowledged.append(mid)
+
+    def settle_acknowledged(self):
+        """Drop acknowledged publishes.  Called with lock held."""
+        while self.acknowledged:
+            self.unacknowledged.discard(self.acknowledged.popleft())
+
+    def reset_topic_aliases(self, properties):
+        """Start a new alias table for a new connection.
+
+        Aliases only live as long as the connection.  They are only used at
+        QoS 0, which the client never sends again on a new connection, so
+        nothing published with an alias can outlive its table.
+        """
+        with self.lock:
+            self.topic_aliases = {}
+            self.topics_published = set()
+            self.topic_alias_maximum = 0
+            if MQTT_TOPIC_ALIASES and properties != None:
+                self.topic_alias_maximum = getattr(properties, "TopicAliasMaximum", 0)
+        logger.info(
+            "MQTT v5 connected, {:d} topic aliases available.".format(
+                self.topic_alias_maximum
+            )
+        )
+
+    def on_mqtt_message(self, client, userdata, message):
+        topics = message.topic.split("/")
+        device = self.devices.get(topics[1]) if len(topics) > 3 else None
+        if device == None:
+            logger.error("No device for message topic={}".format(message.topic))
+            return
+        device.homie_message(client, userdata, message)
+
+    def connect(
+        self,
+        host="localhost",
+        port=1883,
+        username=None,
+        password=None,
+        keepalive=60,
+        bind_address="",
+    ):
+        logger.info("Connecting to mqtt.")
+        if username != None and password != None:
+            self.mqtt.username_pw_set(username=username, password=password)
+
+        # The network loop thread connects and reconnects in the background.
+        self.mqtt.reconnect_delay_set(min_delay=1, max_delay=30)
+        self.mqtt.connect_async(host, port, keepalive, bind_address)
+        self.mqtt.loop_start()
+
+    def inflight(self):
+        """QoS > 0 publishes handed to the client and not yet acknowledged."""
+        with self.lock:
+            self.settle_acknowledged()
+            return len(self.unacknowledged)
+
+    def subscribe(self, topic):
+        self.mqtt.subscribe(topic)
+
+    def buffered(self):
+        """Publishes held in the offline buffer."""
+        return len(self.offline_retained) + len(self.offline_events)
+
+    def publish(
+        self,
+        topic,
+        message,
+        qos=HOMIE_MQTT_QOS,
+        retain=HOMIE_MQTT_RETAIN,
+        expiry=None,
+    ):
+        """Publish message on topic, expiring after expiry seconds (MQTT v5).
+
+        Held in the offline buffer while disconnected.  Once connected a
+        retained publish supersedes any buffered one for its topic, others
+        wait behind buffered events to keep their order.
+        """
+        with self.lock:
+            if self.connected:
+                if retain:
+                    self.offline_retained.pop(topic, None)
+                    self.send(topic, message, qos, retain, expiry)
+                    return
+                if not self.offline_events:
+                    self.send(topic, message, qos, retain, expiry)
+                    return
+            if retain:
+                self.offline_retained.pop(topic, None)
+                self.offline_retained[topic] = (
+                    topic,
+                    message,
+                    qos,
+                    retain,
+                    expiry,
+                    monotonic(),
+                )
+                if len(self.offline_retained) > MQTT_OFFLINE_TOPICS_MAX:
+                    self.offline_retained.popitem(last=False)
+                    self.offline_dropped += 1
+            else:
+                if len(self.offline_events) == self.offline_events.maxlen:
+                    self.offline_dropped += 1
+                self.offline_events.append(
+                    (topic, message, qos, retain, expiry, monotonic())
+                )
+
+    def flush_offline(self, throttle=True):
+        """Send the offline buffer, events first, throttled to
+        MQTT_OFFLINE_FLUSH_RATE."""
+        batch_size = max(1, int(MQTT_OFFLINE_FLUSH_RATE / 10))
+        logger.info(
+            "Flushing {:d} buffered publishes ({:d} dropped).".format(
+                self.buffered(), self.offline_dropped
+            )
+        )
+        while True:
+            with self.lock:
+                if not self.connected or not self.buffered():
+                    self.flushing = False
+                    return
+                for i in range(batch_size):
+                    if self.offline_events:
+                        publish = self.offline_events.popleft()
+                    elif self.offline_retained:
+                        publish = self.offline_retained.popitem(last=False)[1]
+                    else:
+                        break
+                    topic, message, qos, retain, expiry, buffered = publish
+                    if expiry != None:
+                        # Time spent in the buffer counts towards expiry
+                        expiry = int(expiry - (monotonic() - buffered))
+                        if expiry <= 0:
+                            continue
+                    self.send(topic, message, qos, retain, expiry)
+            if throttle:
+                sleep(0.1)
+
+    def send(self, topic, message, qos, retain, expiry):
+        """Hand a publish to the client.  Called with lock held."""
+        if not self.v5:
+            info = self.mqtt.publish(
+                topic=topic, payload=message, qos=qos, retain=retain
+            )
+            self.track(info, qos)
+            return
+        properties = Properties(PacketTypes.PUBLISH)
+        if expiry != None:
+            properties.MessageExpiryInterval = expiry
+        alias_topic = topic
+        if self.topic_alias_maximum > 0 and qos == 0:
+            alias = self.topic_aliases.get(topic)
+            if alias != None:
+                # Alias already set on this connection
+                properties.TopicAlias = alias
+                alias_topic = ""
+                self.alias_bytes_saved += len(topic.encode("utf-8"))
+            elif topic in self.topics_published:
+                if len(self.topic_aliases) < self.topic_alias_maximum:
+                    # Published again: set an alias along with the topic
+                    alias = len(self.topic_aliases) + 1
+                    self.topic_aliases[topic] = alias
+                    properties.TopicAlias = alias
+            else:
+                self.topics_published.add(topic)
+        info = self.mqtt.publish(
+            topic=alias_topic,
+            payload=message,
+            qos=qos,
+            retain=retain,
+            properties=properties,
+        )
+        self.track(info, qos)
+
+    def track(self, info, qos):
+        """Count a QoS > 0 publish until acknowledged.  Called with lock held.
+
+        An acknowledgement can arrive before publish returns, so ids are only
+        settled after being added.
+        """
+        if qos > 0 and info.rc != mqtt.MQTT_ERR_QUEUE_SIZE:
+            self.unacknowledged.add(info.mid)
+        self.settle_acknowledged()
@@ -2,16 +2,98 @@
 import logging
 
 logger = logging.getLogger("paradox_mqtt").getChild(__name__)
-from time import sleep, time
-from datetime import datetime, timedelta
+from time import sleep, monotonic, perf_counter
+from datetime import datetime
 from bits import test_bit, split_high_low_nibble
+from scheduler import Scheduler
+import event_handlers
+import paradox_map
+from metrics import Metrics
+from event_journal import EventJournal
+from diagnostics import Diagnostics
+from link_stats import LinkStats, command_type
+from deadband_filter import DeadbandFilter
 from math import floor
-import paho.mqtt.client as mqtt
+from mqtt_publisher import MQTTPublisher
 import json
+import os
+import threading
 
 from config_defaults import *
 from config import *
 
+# Panel properties in the telemetry class (see HOMIE_MQTT_CLASS_QOS), also
+# published with MQTT_TELEMETRY_EXPIRY_SECONDS message expiry under MQTT v5.
+TELEMETRY_PROPERTIES = (
+    "paneltime",
+    "messagetime",
+    "inputdcvoltage",
+    "powersupplydcvoltage",
+    "batterydcvoltage",
+    "linkframespersecond",
+    "linkutilisation",
+    "linkchecksumfailures",
+    "linkbytesdiscarded",
+    "linkretries",
+    "linkreplytimeouts",
+)
+# Panel properties in the alarm class, other panel properties are metadata.
+ALARM_PANEL_PROPERTIES = ("alarm", "bell")
+# Zone properties published as whole panel bitmaps on the zonebitmap node.
+ZONE_BITMAP_PROPERTIES = {
+    "open": "Zones Open",
+    "bypass": "Zones Bypassed",
+    "alarm": "Zones in Alarm",
+    "tamper": "Zones Tampered",
+    "lowbattery": "Zones Low Battery",
+}
+# State written to the snapshot file, and the only state restored from it.
+SNAPSHOT_PANEL_ATTRIBUTES = (
+    "panelid",
+    "panelname",
+    "firmwareversion",
+    "firmwarerevision",
+    "firmwarebuild",
+    "programmedpanelid1",
+    "programmedpanelid2",
+    "programmedpanelid3",
+    "programmedpanelid4",
+    "alarm",
+    "bell",
+    "input_dc_voltage",
+    "power_supply_dc_voltage",
+    "battery_dc_voltage",
+)
+SNAPSHOT_PARTITION_PROPERTIES = (
+    "alarm",
+    "armed",
+    "armstate",
+    "armstatetext",
+    "armstatehass",
+)
+SNAPSHOT_ZONE_PROPERTIES = (
+    "open",
+    "bypass",
+    "alarm",
+    "firealarm",
+    "shutdown",
+    "tamper",
+    "lowbattery",
+    "supervisiontrouble",
+)
+SNAPSHOT_OUTPUT_PROPERTIES = ("on", "tamper", "supervisiontrouble")
+# Arm and alarm state is only restored from a snapshot younger than
+# STATE_SNAPSHOT_ARM_MAX_AGE_SECONDS.
+SNAPSHOT_ARM_ALARM_STATE = (
+    "alarm",
+    "bell",
+    "armed",
+    "armstate",
+    "armstatetext",
+    "armstatehass",
+    "firealarm",
+)
+
 
 class Paradox:
     def __init__(
@@ -20,27 +102,87 @@ class Paradox:
         encrypted=0,
         alarmeventmap="ParadoxMG5050",
         alarmregmap="ParadoxMG5050",
+        alarmhandlermap="ParadoxMG5050",
+        started=None,
+        publisher=None,
+        homie_device_id=HOMIE_DEVICE_ID,
+        homie_device_name=HOMIE_DEVICE_NAME,
+        hass_device_id=HASS_DEVICE_ID,
+        diagnostics=None,
     ):
-        """Intialise Paradox"""
-        logger.debug("Initialising Paradox class...")
-        # mqtt client
-        self.mqtt = mqtt.Client(client_id=MQTT_CLIENT_ID)
-        self.mqtt.on_connect = self.on_mqtt_connect
-        self.mqtt.on_disconnect = self.on_mqtt_disconnect
-        self.mqtt.on_message = self.homie_message
+        """Intialise Paradox.
 
-        # MQTT Will
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$state")
-        self.mqtt.will_set(
-            topic, payload="lost", qos=HOMIE_MQTT_QOS, retain=HOMIE_MQTT_RETAIN
-        )
+        Without a publisher the panel gets its own MQTT connection, otherwise
+        it shares publisher, and diagnostics if enabled, with the other panels
+        of a gateway.
+        """
+        logger.debug("Initialising Paradox class...")
+        # Startup timing, seconds from started (monotonic) to each step
+        self.started = monotonic() if started == None else started
+        self.startup_timing = {}
+
+        # Homie and Home Assistant device
+        self.homie_device_id = homie_device_id
+        self.homie_device_name = homie_device_name
+        self.hass_device_id = hass_device_id
+        self.homie_state_topic = "{}/{}/{}".format(
+            HOMIE_BASE_TOPIC, self.homie_device_id, "$state"
+        )
+
+        # MQTT
+        self.topic_policies = {}  # topic: (qos, retain, expiry)
+        self.own_publisher = publisher == None
+        if self.own_publisher:
+            publisher = MQTTPublisher(state_topic=self.homie_state_topic)
+        self.publisher = publisher
+        self.publisher.add_device(self.homie_device_id, self)
+        self.running = True
 
         # Connection
         self.connection = connection
 
+        # Optional hot path stage timings and counters, always collected when
+        # they are served over HTTP.
+        self.metrics = Metrics(enabled=METRICS_ENABLED or METRICS_HTTP_PORT != None)
+        self.last_frame_time = None
+        self.keep_alive_seconds = None
+        self.metrics.gauge(
+            "last_frame_age_seconds",
+            "Seconds since the last valid frame from the panel.",
+            lambda: None
+            if self.last_frame_time == None
+            else round(monotonic() - self.last_frame_time, 3),
+        )
+        self.metrics.gauge(
+            "keep_alive_cycle_seconds",
+            "Duration of the last keep alive cycle.",
+            lambda: self.keep_alive_seconds,
+        )
+        self.metrics.gauge(
+            "mqtt_inflight_messages",
+            "MQTT publishes awaiting acknowledgement.",
+            lambda: self.publisher.inflight(),
+        )
+        self.metrics.gauge(
+            "mqtt_offline_buffered_messages",
+            "Publishes held while the MQTT broker is unreachable.",
+            lambda: self.publisher.buffered(),
+        )
+        self.metrics.gauge(
+            "mqtt_offline_dropped_messages",
+            "Publishes dropped from the full offline buffer.",
+            lambda: self.publisher.offline_dropped,
+        )
+        self.metrics.gauge(
+            "mqtt_topic_alias_bytes_saved",
+            "Topic bytes not sent thanks to MQTT v5 topic aliases.",
+            lambda: self.publisher.alias_bytes_saved if self.publisher.v5 else None,
+        )
+
         # My event map and reg maps
         self.alarmeventmap = alarmeventmap
         self.alarmregmap = alarmregmap
+        self.alarmhandlermap = alarmhandlermap
 
         # PanelInfo
         self.panelid = None
@@ -57,6 +199,7 @@ class Paradox:
         self.source_id = 1
         self.paneltime = None
         self.messagetime = None
+        self.messagetime_published = None  # monotonic
 
         # Trouble indicators - not implemented yet
         # Order below is important
@@ -192,10 +335,23 @@ class Paradox:
         self.alarm = False
         self.eventreporting = False
 
-        # Votage Info
+        # Votage Info, averaged and only published when they change by
+        # VOLTAGE_DEADBAND (or at once by VOLTAGE_STEP).
         self.input_dc_voltage = None
         self.power_supply_dc_voltage = None
         self.battery_dc_voltage = None
+        self.voltage_filters = {
+            voltage: DeadbandFilter(
+                deadband=VOLTAGE_DEADBAND,
+                samples=VOLTAGE_AVERAGE_SAMPLES,
+                step=VOLTAGE_STEP,
+            )
+            for voltage in (
+                "inputdcvoltage",
+                "powersupplydcvoltage",
+                "batterydcvoltage",
+            )
+        }
 
         # Bell on?
         self.bell = False
@@ -217,6 +373,22 @@ class Paradox:
         # Bell on?
         self.bell = False
 
+        # Status pages requested by keep_alive.  Pages 3-6 are never decoded so
+        # are not requested.  Adaptive pages back off while live event reporting
+        # is healthy, the bypass page is only read after bypass related events.
+        self.status_pages = {
+            0: {"policy": "adaptive", "interval": KEEP_ALIVE_SECONDS},
+            1: {"policy": "adaptive", "interval": KEEP_ALIVE_SECONDS},
+            2: {"policy": "on_demand", "interval": STATUS_POLL_MAX_SECONDS},
+        }
+        for page in self.status_pages:
+            self.status_pages[page]["due"] = 0
+            self.status_pages[page]["stale"] = True
+        self.link_errors = 0
+        self.keep_alive_link_errors = 0
+        self.link_stats = LinkStats(baudrate=getattr(connection, "baudrate", 9600))
+        self.keep_alive_pipeline_depth = KEEP_ALIVE_PIPELINE_DEPTH
+
         # Zones & Zone Data
         self.zones = ZONES
 
@@ -260,21 +432,92 @@ class Paradox:
             output["tamper"] = False
             self.output_data.append(output)
 
-        # event map
-        mod = __import__("paradox_map", fromlist=[self.alarmeventmap + "EventMap"])
-        self.eventmap = getattr(mod, self.alarmeventmap + "EventMap")
+        # Event map (one instance per panel so labels are not shared), registers
+        # and live event handlers from maps/.  These are replaced by the maps of
+        # the panel model once the panel reports its panelid.
+        self.load_panel_maps()
+        self.event_actions = {
+            "status_page": self.handle_status_page_event,
+            "zone": self.handle_zone_event,
+            "zone_toggle": self.handle_zone_toggle_event,
+            "partition": self.handle_partition_event,
+            "arm_state": self.handle_arm_state_event,
+            "clear_on_disarm": self.handle_clear_on_disarm_event,
+            "bell": self.handle_bell_event,
+            "trouble": self.handle_trouble_event,
+            "module_trouble": self.handle_module_trouble_event,
+            "output": self.handle_output_event,
+        }
 
-        # registers
-        mod = __import__("paradox_map", fromlist=[self.alarmregmap + "Registers"])
-        self.registermap = getattr(mod, self.alarmregmap + "Registers")
+        # housekeeping tasks run from main_loop
+        self.scheduler = Scheduler(wakeup=self.connection.wakeup)
+
+        # Labels are read one register block at a time in the background and
+        # cached so a restart can use them straight away.
+        self.build_label_blocks()
+        self.labels_changed = False
+        self.label_cache_file = None
+        if LABEL_CACHE_FILE != None:
+            self.label_cache_file = LABEL_CACHE_FILE.format(
+                device_id=self.homie_device_id
+            )
+        self.load_label_cache()
+
+        # Last known state is restored at startup and published as provisional
+        # state until the panel reports.
+        self.state_snapshot_file = None
+        if STATE_SNAPSHOT_FILE != None:
+            self.state_snapshot_file = STATE_SNAPSHOT_FILE.format(
+                device_id=self.homie_device_id
+            )
+        self.state_snapshot_saved = None
+        self.load_state_snapshot()
+
+        # Decoded live events are kept in a local SQLite journal.
+        self.event_journal = None
+        if EVENT_JOURNAL_FILE != None:
+            self.event_journal = EventJournal(
+                EVENT_JOURNAL_FILE.format(device_id=self.homie_device_id),
+                max_events=EVENT_JOURNAL_MAX_EVENTS,
+            )
+
+        # On demand thread stacks, memory diffs and profiles, requested by
+        # signal (see main.py) or on diagnostics/command/set.  Profiling and
+        # memory tracing are process wide, so there is one per process.
+        self.diagnostics = diagnostics
+        if self.own_publisher and DIAGNOSTICS_ENABLED:
+            self.diagnostics = Diagnostics(
+                self.homie_device_id,
+                directory=DIAGNOSTICS_DIR,
+                publish=self.homie_publish_diagnostics if DIAGNOSTICS_PUBLISH else None,
+                wakeup=lambda: self.scheduler.trigger("diagnostics"),
+                profile_seconds=DIAGNOSTICS_PROFILE_SECONDS,
+            )
+
+        # Zone properties changed since their bitmap was last published.
+        self.zone_bitmaps_dirty = set()
+        self.zone_bitmaps_published = {}  # property: hex bitmap
+
+        # Current property values per node, published as JSON documents.
+        # Updated from the MQTT thread too (set commands), so guarded by a lock.
+        self.json_state_lock = threading.Lock()
+        self.json_state = {}  # node id: {property id: value}
+        self.json_state_dirty = set()  # node ids changed since last published
+        self.json_state_device_dirty = False  # non-telemetry change
+        self.json_state_published = {}  # topic: last document published
+
+        # Decoded live events waiting to be published on events/live.
+        self.pending_live_events = []
+        self.pending_live_events_since = None
 
         # connect to MQTT
-        self.mqtt_connect(
-            host=MQTT_HOST,
-            port=MQTT_PORT,
-            username=MQTT_USERNAME,
-            password=MQTT_PASSWORD,
-        )
+        if self.own_publisher:
+            self.publisher.connect(
+                host=MQTT_HOST,
+                port=MQTT_PORT,
+                username=MQTT_USERNAME,
+                password=MQTT_PASSWORD,
+            )
 
         # flag Homie init
         self.do_homie_init = True
@@ -284,46 +527,101 @@ class Paradox:
     def on_mqtt_connect(self, client, userdata, flags, rc):
         if rc == 0:
             logger.info("Connected to MQTT...")
-            self.mqtt.subscribe(
+            self.startup_mark("mqtt_connected")
+            self.homie_publish_device_state("init")
+            self.publisher.subscribe(
                 "{}/{}/{}/{}/{}/{}".format(
-                    HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "+", "+", "set", "#"
+                    HOMIE_BASE_TOPIC, self.homie_device_id, "+", "+", "set", "#"
                 )
             )
             self.do_homie_init = True
+            self.scheduler.trigger("homie_init")
         else:
             logger.info("Connectetion to MQTT failed return code of {}.".format(rc))
 
-    def on_mqtt_disconnect(self, client, userdata, rc):
-        logger.info("MQTT was disconnected with return code of {}".format(rc))
+    def startup_mark(self, step):
+        """Record the time of the first occurrence of a startup step.
 
-    def mqtt_connect(
-        self,
-        host="localhost",
-        port=1883,
-        username=None,
-        password=None,
-        keepalive=60,
-        bind_address="",
-    ):
-        logger.info("Connecting to mqtt.")
-        if username != None and password != None:
-            self.mqtt.username_pw_set(username=username, password=password)
-
-        error = True
-        while error:
-            try:
-                self.mqtt.connect(host, port, keepalive, bind_address)
-                error = False
-            except Exception as e:
-                logger.error("{} for MQTT.  Retrying...".format(e))
-                error = True
-                sleep(5)
-        self.mqtt.loop_start()
-
-    def homie_publish(self, topic, message):
-        self.mqtt.publish(
-            topic=topic, payload=message, qos=HOMIE_MQTT_QOS, retain=HOMIE_MQTT_RETAIN
-        )
+        Once the panel status has been read the full breakdown is logged and
+        published as panel/startuptiming.
+        """
+        if step in self.startup_timing:
+            return
+        self.startup_timing[step] = round(monotonic() - self.started, 3)
+        logger.debug("Startup: %s after %.3fs.", step, self.startup_timing[step])
+        if step == "panel_status":
+            logger.info(
+                "Startup timing: %s",
+                ", ".join(
+                    "{} {:.3f}s".format(s, t) for s, t in self.startup_timing.items()
+                ),
+            )
+            self.homie_publish_property(
+                node_id="panel",
+                property_id="startuptiming",
+                datatype="string",
+                value=json.dumps(self.startup_timing),
+            )
+
+    def homie_publish(self, topic, message, retain=None):
+        """Publish with the QoS, retain and expiry of the class of topic.
+        retain overrides the class retain flag."""
+        policy = self.topic_policies.get(topic)
+        if policy == None:
+            policy = self.topic_policies[topic] = self.topic_policy(topic)
+        qos, class_retain, expiry = policy
+        if retain == None:
+            retain = class_retain
+        if self.metrics.enabled:
+            started = perf_counter()
+            self.publisher.publish(
+                topic, message, qos=qos, retain=retain, expiry=expiry
+            )
+            elapsed = perf_counter() - started
+            self.metrics.observe("publish", elapsed)
+            self.metrics.publish_seconds += elapsed
+            self.metrics.inc("publishes", self.topic_class(topic))
+        else:
+            self.publisher.publish(
+                topic, message, qos=qos, retain=retain, expiry=expiry
+            )
+
+    def property_class(self, topic):
+        """QoS and retain class of topic: alarm, zone, telemetry or metadata."""
+        node = self.topic_class(topic)
+        if node in ("hass", "meta", "diagnostics"):
+            return "metadata"
+        if node == "panel":
+            property = topic.split("/")[3]
+            if property in ALARM_PANEL_PROPERTIES:
+                return "alarm"
+            if property in TELEMETRY_PROPERTIES:
+                return "telemetry"
+            return "metadata"
+        if node in ("zone", "lastzoneevent", "zonebitmap"):
+            return "zone"
+        return "alarm"
+
+    def topic_policy(self, topic):
+        """(qos, retain, expiry) of topic from its property class."""
+        property_class = self.property_class(topic)
+        qos = HOMIE_MQTT_CLASS_QOS.get(property_class)
+        retain = HOMIE_MQTT_CLASS_RETAIN.get(property_class)
+        return (
+            HOMIE_MQTT_QOS if qos == None else qos,
+            HOMIE_MQTT_RETAIN if retain == None else retain,
+            MQTT_TELEMETRY_EXPIRY_SECONDS if property_class == "telemetry" else None,
+        )
+
+    def topic_class(self, topic):
+        """Publish class of topic for metrics: hass, meta (Homie $ attributes)
+        or the node type (panel, partition, zone, ...)."""
+        if topic.startswith(HASS_BASE_TOPIC + "/"):
+            return "hass"
+        topics = topic.split("/")
+        if len(topics) < 4 or topics[-1].startswith("$"):
+            return "meta"
+        return topics[2].rstrip("0123456789")
 
     def homie_message_ON_OFF(self, message):
         if message in ["ON", "OFF"]:
@@ -456,14 +754,18 @@ class Paradox:
 
     def homie_message(self, client, userdata, message):
         logger.info(
-            "message topic={}, message={}".format(
-                message.topic, str(message.payload.decode("utf-8"))
-            )
+            "message topic=%s, message=%s",
+            message.topic,
+            message.payload.decode("utf-8"),
         )
         node_found = False
         topics = message.topic.split("/")
         node_id = topics[2]
         property = topics[3]
+        if node_id == "diagnostics" and self.diagnostics != None:
+            if property == "command":
+                self.diagnostics.request(message.payload.decode("utf-8"))
+            return
         for i in range(1, 2 + 1):
             if node_id == self.partition_data[i]["machine_label"]:
                 self.homie_partition_property_set(
@@ -487,60 +789,102 @@ class Paradox:
 
     def main_loop(self):
         """Wait for and then process messages."""
-        keep_alive_time = datetime(1900, 1, 1)
-        label_time = datetime(1900, 1, 1)
-        homie_init_time = datetime(1900, 1, 1)
-        homie_publish_all_time = datetime(1900, 1, 1)
-        output_pulse_time = datetime(1900, 1, 1)
-        while True:
-            if self.connection.in_waiting() >= 37:
-                message = self.connection.read()
-                logger.debug("Received message: {} ".format(message))
-                self.process_message(message)
-            sleep(0.1)
-            if not self.softwareconnected:
-                self.connect_software()
-            if datetime.now() > label_time + timedelta(seconds=READ_LABELS_SECONDS):
-                self.read_labels()
-                label_time = datetime.now()
-            if datetime.now() > keep_alive_time + timedelta(seconds=KEEP_ALIVE_SECONDS):
-                self.keep_alive()
-                keep_alive_time = datetime.now()
-            if self.do_homie_init or datetime.now() > homie_init_time + timedelta(
-                seconds=HOMIE_INIT_SECONDS
-            ):
-                self.homie_init()
-                homie_init_time = datetime.now()
-            if datetime.now() > homie_publish_all_time + timedelta(
-                seconds=HOMIE_PUBLISH_ALL_SECONDS
-            ):
-                self.homie_publish_all()
-                homie_publish_all_time = datetime.now()
-            if datetime.now() > output_pulse_time + timedelta(
-                seconds=OUTPUT_PULSE_SECONDS
-            ):
-                self.pulse_outputs()
-                output_pulse_time = datetime.now()
+        # Tasks due together run in the order added: publish (provisional)
+        # state first, then set up the panel session.
+        self.scheduler.add("homie_init", HOMIE_INIT_SECONDS, self.homie_init)
+        self.scheduler.add(
+            "homie_publish_all",
+            HOMIE_PUBLISH_ALL_SECONDS,
+            self.homie_publish_all,
+            delay=HOMIE_PUBLISH_ALL_SECONDS,
+        )
+        self.scheduler.add("connect_software", 5, self.check_software_connection)
+        self.scheduler.add("labels", LABEL_BLOCK_SECONDS, self.read_next_label_block)
+        self.scheduler.add("keep_alive", KEEP_ALIVE_SECONDS, self.keep_alive)
+        self.scheduler.add("pulse_outputs", OUTPUT_PULSE_SECONDS, self.pulse_outputs)
+        if self.state_snapshot_file != None:
+            self.scheduler.add(
+                "state_snapshot",
+                STATE_SNAPSHOT_SECONDS,
+                self.save_state_snapshot,
+                delay=STATE_SNAPSHOT_SECONDS,
+            )
+        if JSON_STATE_ENABLED:
+            self.scheduler.add(
+                "json_state", JSON_STATE_SECONDS, self.homie_publish_json_state
+            )
+        self.scheduler.add(
+            "link_stats",
+            LINK_STATS_SECONDS,
+            self.homie_publish_link_stats,
+            delay=LINK_STATS_SECONDS,
+        )
+        if self.diagnostics != None:
+            self.scheduler.add("diagnostics", 1, self.diagnostics.poll)
+        if self.metrics.enabled:
+            self.scheduler.add(
+                "metrics",
+                METRICS_LOG_SECONDS,
+                self.metrics.log_summary,
+                delay=METRICS_LOG_SECONDS,
+            )
+        try:
+            while self.running:
+                timeout = self.scheduler.time_until_next(maximum=1)
+                if self.connection.wait_for_bytes(37, timeout=timeout):
+                    if self.metrics.enabled:
+                        started = perf_counter()
+                        message = self.connection.read()
+                        self.metrics.observe("serial_read", perf_counter() - started)
+                    else:
+                        message = self.connection.read()
+                    logger.debug("Received message: %s ", message)
+                    self.link_stats.received(message)
+                    self.process_message(message)
+                if self.pending_live_events:
+                    self.flush_live_events()
+                self.scheduler.run_pending()
+                if self.pending_live_events:
+                    self.flush_live_events()
+                if self.zone_bitmaps_dirty:
+                    self.homie_publish_zone_bitmaps()
+        finally:
+            # Closed here rather than in stop, so the journal is not closed
+            # under process_live_event_command and queued events are written.
+            if self.event_journal != None:
+                self.event_journal.stop()
+                self.event_journal = None
+
+    def stop(self):
+        """Make main_loop return after the current pass."""
+        self.running = False
+        self.connection.wakeup()
+
+    def check_software_connection(self):
+        if not self.connection.is_connected():
+            if not self.connection.connect():
+                return
+            self.startup_mark("serial_connected")
+        if not self.softwareconnected:
+            if self.connect_software():
+                self.startup_mark("software_connected")
 
     def wait_for_message(self, timeout=1, process_message=False):
         """Wait (up to timeout) untill buffer is filled with 37 bytes and then return message."""
-        tstart = time()
-        while time() < tstart + timeout:
-            if self.connection.in_waiting() >= 37:
-                message = self.connection.read()
-                logger.debug("Received message: {} ".format(message))
-                if process_message:
-                    self.process_message(message)
-                return message
-            sleep(0.1)
+        if self.connection.wait_for_bytes(37, timeout=timeout):
+            message = self.connection.read()
+            logger.debug("Received message: %s ", message)
+            self.link_stats.received(message)
+            if process_message:
+                self.process_message(message)
+            return message
         return None
 
     def timestamp_str(self, date=datetime.now()):
         return "{}".format(datetime.now().isoformat())
 
     def homie_publish_device_state(self, state):
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$state")
-        self.homie_publish(topic, state)
+        self.homie_publish(self.homie_state_topic, state)
 
     def homie_init(self):
         # device to init
@@ -552,18 +896,27 @@ class Paradox:
         self.homie_init_outputs()
         self.homie_init_zones()
         self.homie_init_last_zone_event()
+        if LIVE_EVENTS_ENABLED:
+            self.homie_init_events()
+        if self.diagnostics != None:
+            self.homie_init_diagnostics()
+        if ZONE_BITMAP_ENABLED:
+            self.homie_init_zone_bitmaps()
 
         # device ready
         self.homie_publish_device_state("ready")
+        if self.do_homie_init:
+            # Startup or MQTT reconnect rather than the daily refresh.
+            self.homie_publish_all(init=True)
         self.do_homie_init = False
 
     def homie_init_device(self):
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$homie")
+        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, self.homie_device_id, "$homie")
         self.homie_publish(topic, HOMIE_DEVICE_VERSION)
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$name")
-        self.homie_publish(topic, HOMIE_DEVICE_NAME)
+        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, self.homie_device_id, "$name")
+        self.homie_publish(topic, self.homie_device_name)
         self.homie_publish_device_state("init")
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$nodes")
+        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, self.homie_device_id, "$nodes")
         nodes = "panel,troubleindicators,moduletroubleindicators"
         for i in range(1, 2 + 1):
             nodes = nodes + "," + self.partition_data[i]["machine_label"]
@@ -572,34 +925,53 @@ class Paradox:
         for i in range(1, self.zones + 1):
             nodes = nodes + "," + self.zone_data[i]["machine_label"]
         nodes = nodes + ",lastzoneevent"
+        if LIVE_EVENTS_ENABLED:
+            nodes = nodes + ",events"
+        if self.diagnostics != None:
+            nodes = nodes + ",diagnostics"
+        if ZONE_BITMAP_ENABLED:
+            nodes = nodes + ",zonebitmap"
         self.homie_publish(topic, nodes)
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$extensions")
+        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, self.homie_device_id, "$extensions")
         self.homie_publish(topic, "")
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$implementation")
+        topic = "{}/{}/{}".format(
+            HOMIE_BASE_TOPIC, self.homie_device_id, "$implementation"
+        )
         self.homie_publish(topic, HOMIE_IMPLEMENTATION)
         # self.homie_publish(topic, 'satus, voltages, partition[], output[], zone[]')
 
     def homie_publish_all(self, init=False):
+        self.startup_mark("provisional_state")
+        if init:
+            # Retained documents and bitmaps are only republished unchanged
+            # after a (re)connect, otherwise just when they change.
+            self.json_state_published = {}
+            with self.json_state_lock:
+                self.json_state_dirty.update(self.json_state)
+                self.json_state_device_dirty = True
+            self.zone_bitmaps_published = {}
         self.homie_publish_panel()
         self.homie_publish_trouble_indicators()
         self.homie_publish_module_trouble_indicators()
         self.homie_publish_partitions()
         self.homie_publish_outputs()
         self.homie_publish_zones()
+        if ZONE_BITMAP_ENABLED:
+            self.homie_publish_zone_bitmaps()
 
     def homie_init_node(self, node_id, name, type=None, properties=None):
         topic = "{}/{}/{}/{}".format(
-            HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, "$name"
+            HOMIE_BASE_TOPIC, self.homie_device_id, node_id, "$name"
         )
         self.homie_publish(topic, name)
         if type != None:
             topic = "{}/{}/{}/{}".format(
-                HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, "$type"
+                HOMIE_BASE_TOPIC, self.homie_device_id, node_id, "$type"
             )
             self.homie_publish(topic, type)
         if properties != None:
             topic = "{}/{}/{}/{}".format(
-                HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, "$properties"
+                HOMIE_BASE_TOPIC, self.homie_device_id, node_id, "$properties"
             )
             self.homie_publish(topic, properties)
 
@@ -616,28 +988,106 @@ class Paradox:
     def homie_publish_property(self, node_id, property_id, datatype, value=None):
         if value != None:
             topic = "{}/{}/{}/{}".format(
-                HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id
+                HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id
             )
             if datatype == "boolean":
                 message = self.homie_message_boolean(value)
             else:
                 message = value
             self.homie_publish(topic, message)
+            if JSON_STATE_ENABLED:
+                self.update_json_state(node_id, property_id, datatype, value)
+
+    def update_json_state(self, node_id, property_id, datatype, value):
+        if datatype == "boolean":
+            value = bool(value)
+        elif datatype == "integer":
+            value = int(value)
+        elif datatype == "float":
+            value = float(value)
+        with self.json_state_lock:
+            node = self.json_state.get(node_id)
+            if node == None:
+                node = self.json_state[node_id] = {}
+            if property_id not in node or node[property_id] != value:
+                node[property_id] = value
+                self.json_state_dirty.add(node_id)
+                if not self.json_telemetry(node_id, property_id):
+                    self.json_state_device_dirty = True
+
+    def json_telemetry(self, node_id, property_id):
+        """Whether a property is telemetry, left out of the device document."""
+        return node_id == "panel" and property_id in TELEMETRY_PROPERTIES
+
+    def homie_publish_json_state(self):
+        """Publish the JSON documents of changed nodes and of the device.
+
+        Changes are coalesced over JSON_STATE_SECONDS.  Each node document
+        holds every property value of the node.  The device one holds every
+        node without the telemetry, so it is only published when something
+        else changed.
+        """
+        with self.json_state_lock:
+            if not self.json_state_dirty:
+                return
+            dirty, self.json_state_dirty = self.json_state_dirty, set()
+            device_dirty, self.json_state_device_dirty = (
+                self.json_state_device_dirty,
+                False,
+            )
+            nodes = {node_id: dict(node) for node_id, node in self.json_state.items()}
+        for node_id in sorted(dirty):
+            topic = "{}/{}/{}/{}".format(
+                HOMIE_BASE_TOPIC, self.homie_device_id, node_id, "$json"
+            )
+            self.homie_publish_json_document(topic, nodes[node_id])
+        if not device_dirty:
+            return
+        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, self.homie_device_id, "$json")
+        self.homie_publish_json_document(
+            topic,
+            {
+                node_id: {
+                    property_id: value
+                    for property_id, value in node.items()
+                    if not self.json_telemetry(node_id, property_id)
+                }
+                for node_id, node in nodes.items()
+            },
+        )
+
+    def homie_publish_json_document(self, topic, document):
+        """Publish document on topic unless it is what was last published."""
+        message = json.dumps(document, separators=(",", ":"))
+        if self.json_state_published.get(topic) != message:
+            self.json_state_published[topic] = message
+            self.homie_publish(topic, message)
 
     def get_hass_config_template(self):
-        topic = "{}/{}/{}".format(HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, "$state")
-        config_template = {
-            "availability": {
-                "topic": topic,
+        availability = [
+            {
+                "topic": self.homie_state_topic,
                 "payload_available": "ready",
                 "payload_not_available": "lost",
-            },
+            }
+        ]
+        if self.publisher.state_topic != self.homie_state_topic:
+            # Gateway: the broker only sets the gateway state to lost.
+            availability.append(
+                {
+                    "topic": self.publisher.state_topic,
+                    "payload_available": "ready",
+                    "payload_not_available": "lost",
+                }
+            )
+        config_template = {
+            "availability": availability[0] if len(availability) == 1 else availability,
             "code_arm_required": HASS_ALARM_CODE_ARM_REQUIRED,
             "code_disarm_required": HASS_ALARM_CODE_DISARM_REQUIRED,
             "code_trigger_required": HASS_ALARM_CODE_TRIGGER_REQUIRED,
-            "availability_mode": "latest",
+            "availability_mode": "latest" if len(availability) == 1 else "all",
             "device": {
-                "identifiers": HASS_DEVICE_ID,
+                "identifiers": self.hass_device_id,
                 "model": "Paradox MG5050",
                 "name": "Paradox MG5050",
                 "sw_version": self.firmwareversion,
@@ -662,18 +1112,18 @@ class Paradox:
         config = self.get_hass_config_template()
 
         component = "Unknown"
-        unique_id = HOMIE_DEVICE_ID + "_" + node_id + "_" + property_id
+        unique_id = self.homie_device_id + "_" + node_id + "_" + property_id
         config["name"] = name
         config["object_id"] = unique_id
         config["state_topic"] = "{}/{}/{}/{}".format(
             HOMIE_BASE_TOPIC,
-            HOMIE_DEVICE_ID,
+            self.homie_device_id,
             node_id,
             property_id,
         )
         command_topic = "{}/{}/{}/{}/{}".format(
             HOMIE_BASE_TOPIC,
-            HOMIE_DEVICE_ID,
+            self.homie_device_id,
             node_id,
             property_id,
             "set",
@@ -748,24 +1198,26 @@ class Paradox:
         config = self.get_hass_config_template()
         config["state_topic"] = "{}/{}/{}/{}".format(
             HOMIE_BASE_TOPIC,
-            HOMIE_DEVICE_ID,
+            self.homie_device_id,
             "partition" + str(partition),
             "armstatehass",
         )
         config["command_topic"] = "{}/{}/{}/{}/{}".format(
             HOMIE_BASE_TOPIC,
-            HOMIE_DEVICE_ID,
+            self.homie_device_id,
             "partition" + str(partition),
             "armstatehass",
             "set",
         )
+        # Gateway panels prefix ids with their device id to keep them unique.
+        prefix = self.homie_device_id + "_" if self.publisher.gateway else ""
         config["name"] = "Alarm Partition " + str(partition)
-        config["object_id"] = "alarm_partition" + str(partition)
+        config["object_id"] = prefix + "alarm_partition" + str(partition)
         config["payload_arm_away"] = "armed_away"
         config["payload_arm_night"] = "armed_night"
         config["payload_arm_home"] = "armed_home"
         config["payload_disarm"] = "disarmed"
-        config["unique_id"] = "alarmpartition" + str(partition)
+        config["unique_id"] = prefix + "alarmpartition" + str(partition)
         topic = "{}/{}/{}/{}".format(
             HASS_BASE_TOPIC,
             "alarm_control_panel",
@@ -785,43 +1237,45 @@ class Paradox:
         settable=False,
         retained=True,
         unit=None,
+        hass=True,
     ):
         topic = "{}/{}/{}/{}/{}".format(
-            HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id, "$name"
+            HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id, "$name"
         )
         self.homie_publish(topic, name)
         topic = "{}/{}/{}/{}/{}".format(
-            HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id, "$datatype"
+            HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id, "$datatype"
         )
         self.homie_publish(topic, datatype)
         if format != None:
             topic = "{}/{}/{}/{}/{}".format(
-                HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id, "$format"
+                HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id, "$format"
             )
             self.homie_publish(topic, format)
         topic = "{}/{}/{}/{}/{}".format(
-            HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id, "$settable"
+            HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id, "$settable"
         )
         self.homie_publish_boolean(topic, settable)
         topic = "{}/{}/{}/{}/{}".format(
-            HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id, "$retained"
+            HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id, "$retained"
         )
         self.homie_publish_boolean(topic, retained)
         if unit != None:
             topic = "{}/{}/{}/{}/{}".format(
-                HOMIE_BASE_TOPIC, HOMIE_DEVICE_ID, node_id, property_id, "$unit"
+                HOMIE_BASE_TOPIC, self.homie_device_id, node_id, property_id, "$unit"
             )
             self.homie_publish(topic, unit)
 
-        self.hass_init_config(
-            node_id, property_id, name, datatype, format, settable, retained, unit
-        )
+        if hass:
+            self.hass_init_config(
+                node_id, property_id, name, datatype, format, settable, retained, unit
+            )
 
     def homie_init_panel(self):
         self.homie_init_node(
             node_id="panel",
             name="Panel",
-            properties="panelid,panelname,firmwareversion,firmwarerevision,firmwarebuild,programmedpanelida,programmedpanelidb,programmedpanelid1,programmedpanelid2,programmedpanelid3,programmedpanelid4,paneltime,messagetime,softwaredirectconnected,softwareconnected,alarm,eventreporting,bell,inputdcvoltage,powersupplydcvoltage,batterydcvoltage",
+            properties="panelid,panelname,firmwareversion,firmwarerevision,firmwarebuild,programmedpanelida,programmedpanelidb,programmedpanelid1,programmedpanelid2,programmedpanelid3,programmedpanelid4,paneltime,messagetime,startuptiming,softwaredirectconnected,softwareconnected,alarm,eventreporting,bell,inputdcvoltage,powersupplydcvoltage,batterydcvoltage,linkframespersecond,linkutilisation,linkchecksumfailures,linkbytesdiscarded,linkretries,linkreplytimeouts",
         )
         self.homie_init_property(
             node_id="panel", property_id="panelid", name="Panel ID", datatype="integer"
@@ -898,6 +1352,12 @@ class Paradox:
             name="Message Time",
             datatype="string",
         )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="startuptiming",
+            name="Startup Timing",
+            datatype="string",
+        )
         self.homie_init_property(
             node_id="panel",
             property_id="softwaredirectconnected",
@@ -943,6 +1403,83 @@ class Paradox:
             datatype="float",
             unit="v",
         )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="linkframespersecond",
+            name="Link Frames per Second",
+            datatype="float",
+            unit="#/s",
+        )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="linkutilisation",
+            name="Link Utilisation",
+            datatype="float",
+            unit="%",
+        )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="linkchecksumfailures",
+            name="Link Checksum Failures",
+            datatype="integer",
+        )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="linkbytesdiscarded",
+            name="Link Bytes Discarded",
+            datatype="integer",
+        )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="linkretries",
+            name="Link Retries",
+            datatype="integer",
+        )
+        self.homie_init_property(
+            node_id="panel",
+            property_id="linkreplytimeouts",
+            name="Link Reply Timeouts",
+            datatype="string",
+        )
+
+    def homie_publish_link_stats(self):
+        frames_per_second, utilisation = self.link_stats.sample()
+        self.homie_publish_property(
+            node_id="panel",
+            property_id="linkframespersecond",
+            datatype="float",
+            value=frames_per_second,
+        )
+        self.homie_publish_property(
+            node_id="panel",
+            property_id="linkutilisation",
+            datatype="float",
+            value=utilisation,
+        )
+        self.homie_publish_property(
+            node_id="panel",
+            property_id="linkchecksumfailures",
+            datatype="integer",
+            value=self.link_stats.checksum_failures,
+        )
+        self.homie_publish_property(
+            node_id="panel",
+            property_id="linkbytesdiscarded",
+            datatype="integer",
+            value=self.link_stats.bytes_discarded,
+        )
+        self.homie_publish_property(
+            node_id="panel",
+            property_id="linkretries",
+            datatype="integer",
+            value=self.link_stats.retries,
+        )
+        self.homie_publish_property(
+            node_id="panel",
+            property_id="linkreplytimeouts",
+            datatype="string",
+            value=json.dumps(self.link_stats.reply_timeouts, sort_keys=True),
+        )
 
     def homie_init_trouble_indicators(self):
         trouble_properties = ",".join(
@@ -1452,6 +1989,120 @@ class Paradox:
                 value=self.timestamp_str(),
             )
 
+    def homie_init_zone_bitmaps(self):
+        self.homie_init_node(
+            node_id="zonebitmap",
+            name="Zone Bitmaps",
+            properties=",".join(ZONE_BITMAP_PROPERTIES),
+        )
+        for property, name in ZONE_BITMAP_PROPERTIES.items():
+            self.homie_init_property(
+                node_id="zonebitmap",
+                property_id=property,
+                name=name,
+                datatype="string",
+                hass=False,
+            )
+
+    def zone_bitmap(self, property):
+        """Hex string with bit n - 1 set when property is true for zone n."""
+        bitmap = 0
+        for i in range(1, self.zones + 1):
+            if self.zone_data[i][property]:
+                bitmap |= 1 << (i - 1)
+        return "{:0{}x}".format(bitmap, (self.zones + 3) // 4)
+
+    def homie_publish_zone_bitmaps(self):
+        """Publish the bitmaps that changed, once per main loop pass so a
+        status page updating many zones gives one message per property."""
+        self.zone_bitmaps_dirty = set()
+        for property in ZONE_BITMAP_PROPERTIES:
+            bitmap = self.zone_bitmap(property)
+            if self.zone_bitmaps_published.get(property) != bitmap:
+                self.zone_bitmaps_published[property] = bitmap
+                self.homie_publish_property(
+                    node_id="zonebitmap",
+                    property_id=property,
+                    datatype="string",
+                    value=bitmap,
+                )
+
+    def homie_init_events(self):
+        self.homie_init_node(
+            node_id="events",
+            name="Live Events",
+            properties="live",
+        )
+        # Not retained and not offered to Home Assistant: each message is a
+        # JSON array of one or more events, see queue_live_event.
+        self.homie_init_property(
+            node_id="events",
+            property_id="live",
+            name="Live Events",
+            datatype="string",
+            retained=False,
+            hass=False,
+        )
+
+    def homie_init_diagnostics(self):
+        self.homie_init_node(
+            node_id="diagnostics",
+            name="Diagnostics",
+            properties="command,output",
+        )
+        self.homie_init_property(
+            node_id="diagnostics",
+            property_id="command",
+            name="Diagnostics Command",
+            datatype="string",
+            settable=True,
+            retained=False,
+            hass=False,
+        )
+        self.homie_init_property(
+            node_id="diagnostics",
+            property_id="output",
+            name="Diagnostics Output",
+            datatype="string",
+            retained=False,
+            hass=False,
+        )
+
+    def homie_publish_diagnostics(self, text):
+        topic = "{}/{}/{}/{}".format(
+            HOMIE_BASE_TOPIC, self.homie_device_id, "diagnostics", "output"
+        )
+        self.homie_publish(topic, text, retain=False)
+
+    def queue_live_event(self, live_event):
+        """Queue a decoded live event for events/live."""
+        if not self.pending_live_events:
+            self.pending_live_events_since = monotonic()
+        self.pending_live_events.append(live_event)
+
+    def flush_live_events(self):
+        """Publish the queued live events as one JSON array.
+
+        Events are held while another frame is already waiting so a burst
+        goes out in few messages, up to LIVE_EVENTS_BATCH_MAX events or
+        LIVE_EVENTS_BATCH_SECONDS after the first of them.
+        """
+        if (
+            self.connection.in_waiting() >= 37
+            and len(self.pending_live_events) < LIVE_EVENTS_BATCH_MAX
+            and monotonic() - self.pending_live_events_since < LIVE_EVENTS_BATCH_SECONDS
+        ):
+            return
+        topic = "{}/{}/{}/{}".format(
+            HOMIE_BASE_TOPIC, self.homie_device_id, "events", "live"
+        )
+        self.homie_publish(
+            topic,
+            json.dumps(self.pending_live_events, separators=(",", ":")),
+            retain=False,
+        )
+        self.pending_live_events = []
+
     def update_bell(self, bell):
         if bell != self.bell:
             self.bell = bell
@@ -1481,18 +2132,14 @@ class Paradox:
             or self.programmedpanelidb != programmedpanelidb
         ):
             self.panelid = panelid
-            if panelid == 21:
-                self.panelname = "SP5500"
-            elif panelid == 22:
-                self.panelname = "SP6000"
-            elif panelid == 23:
-                self.panelname = "SP7000"
-            elif panelid == 64:
-                self.panelname = "MG5000"
-            elif panelid == 65:
-                self.panelname = "MG5050"
+            model = paradox_map.get_panel_model(panelid)
+            if model != None:
+                self.panelname = model["panelname"]
+                self.load_panel_maps(
+                    model["events"], model["registers"], model["handlers"]
+                )
             else:
-                logger.error("Invalid panelid {:d}".format(panelid))
+                logger.error("Invalid panelid %d", panelid)
             self.firmwareversion = firmwareversion
             self.firmwarerevision = firmwarerevision
             self.firmwarebuild = firmwarebuild
@@ -1504,41 +2151,99 @@ class Paradox:
             )
             self.homie_publish_panel()
 
+    def load_panel_maps(self, eventmap=None, regmap=None, handlermap=None):
+        """Load the event, register and handler maps, if they changed.
+
+        Labels already known are set on the new event map and the label sweep
+        is rebuilt for the new registers.
+        """
+        eventmap = self.alarmeventmap if eventmap == None else eventmap
+        regmap = self.alarmregmap if regmap == None else regmap
+        handlermap = self.alarmhandlermap if handlermap == None else handlermap
+        if hasattr(self, "eventmap") and (eventmap, regmap, handlermap) == (
+            self.alarmeventmap,
+            self.alarmregmap,
+            self.alarmhandlermap,
+        ):
+            return
+        logger.info(
+            "Using maps events={}, registers={}, handlers={}.".format(
+                eventmap, regmap, handlermap
+            )
+        )
+        self.alarmeventmap = eventmap
+        self.alarmregmap = regmap
+        self.alarmhandlermap = handlermap
+        self.eventmap = paradox_map.PanelEventMap(eventmap)
+        self.registermap = paradox_map.PanelRegisters(regmap)
+        self.arm_states, self.event_handlers = event_handlers.get_handlers(handlermap)
+        if hasattr(self, "label_blocks"):
+            labels_changed = self.labels_changed
+            for item, labels in self.label_cache().items():
+                for number, label in labels.items():
+                    self.update_label_item(item, number, label=label)
+            self.labels_changed = labels_changed
+            self.build_label_blocks()
+
+    def build_label_blocks(self):
+        """List the (item, first label number) blocks of a label sweep."""
+        self.label_blocks = []
+        for item, count in (
+            ("zoneLabel", self.zones),
+            ("userLabel", self.users),
+            ("partitionLabel", 2),
+            ("outputLabel", self.outputs),
+        ):
+            register_dict = getattr(self.registermap, "get" + item + "Register")()
+            for number in range(1, count + 1, 2):
+                if number in register_dict:
+                    self.label_blocks.append((item, number))
+        self.label_block_index = 0
+
     def update_voltages(
         self, input_dc_voltage, power_supply_dc_voltage, battery_dc_voltage
     ):
-        self.input_dc_voltage = input_dc_voltage
-        self.power_supply_dc_voltage = power_supply_dc_voltage
-        self.battery_dc_voltage = battery_dc_voltage
-        self.homie_publish_property(
-            node_id="panel",
-            property_id="inputdcvoltage",
-            datatype="float",
-            value=self.input_dc_voltage,
-        )
-        self.homie_publish_property(
-            node_id="panel",
-            property_id="powersupplydcvoltage",
-            datatype="float",
-            value=self.power_supply_dc_voltage,
-        )
-        self.homie_publish_property(
-            node_id="panel",
-            property_id="batterydcvoltage",
-            datatype="float",
-            value=self.battery_dc_voltage,
+        value = self.voltage_filters["inputdcvoltage"].update(input_dc_voltage)
+        if value != None:
+            self.input_dc_voltage = value
+            self.homie_publish_property(
+                node_id="panel",
+                property_id="inputdcvoltage",
+                datatype="float",
+                value=self.input_dc_voltage,
+            )
+        value = self.voltage_filters["powersupplydcvoltage"].update(
+            power_supply_dc_voltage
         )
-        logger.debug(
-            "input_dc_voltage: {:.2f} | power_supply_dc_voltage: {:.2f} | battery_dc_voltage: {:.2f}".format(
-                input_dc_voltage, power_supply_dc_voltage, battery_dc_voltage
+        if value != None:
+            self.power_supply_dc_voltage = value
+            self.homie_publish_property(
+                node_id="panel",
+                property_id="powersupplydcvoltage",
+                datatype="float",
+                value=self.power_supply_dc_voltage,
             )
+        value = self.voltage_filters["batterydcvoltage"].update(battery_dc_voltage)
+        if value != None:
+            self.battery_dc_voltage = value
+            self.homie_publish_property(
+                node_id="panel",
+                property_id="batterydcvoltage",
+                datatype="float",
+                value=self.battery_dc_voltage,
+            )
+        logger.debug(
+            "input_dc_voltage: %.2f | power_supply_dc_voltage: %.2f | battery_dc_voltage: %.2f",
+            input_dc_voltage,
+            power_supply_dc_voltage,
+            battery_dc_voltage,
         )
 
     def update_partition_property(
         self, partition_number, property="armstate", value=None
     ):
         if partition_number > 2 or partition_number < 0:
-            logger.error("Invalid partition_number {:d}".format(partition_number))
+            logger.error("Invalid partition_number %d", partition_number)
             return
         if value != None:
             if (
@@ -1548,9 +2253,11 @@ class Paradox:
                 label = self.partition_data[partition_number]["label"]
                 self.partition_data[partition_number][property] = value
                 logger.info(
-                    'Partition {:d},"{}", {} = {}.'.format(
-                        partition_number, label, property, value
-                    )
+                    'Partition %d,"%s", %s = %s.',
+                    partition_number,
+                    label,
+                    property,
+                    value,
                 )
                 if property in ["alarm"]:
                     self.homie_publish_property(
@@ -1590,9 +2297,16 @@ class Paradox:
                 if property == "armstate" and value == 0:
                     self.clear_on_disarm()
 
+    def update_partition_arm_state(self, partition_number, state):
+        """Apply the armed, armstate, armstatetext and armstatehass of state."""
+        for property, value in self.arm_states[state]:
+            self.update_partition_property(
+                partition_number=partition_number, property=property, value=value
+            )
+
     def update_output_property(self, output_number, property=None, flag=None):
         if output_number > self.outputs or output_number < 1:
-            logger.error("Invalid output_number {:d}".format(output_number))
+            logger.error("Invalid output_number %d", output_number)
             return
         if flag != None:
             if (
@@ -1602,14 +2316,10 @@ class Paradox:
                 label = self.output_data[output_number]["label"]
                 self.output_data[output_number][property] = flag
                 if flag:
-                    logger.info(
-                        'Output {:d},"{}", {}.'.format(output_number, label, property)
-                    )
+                    logger.info('Output %d,"%s", %s.', output_number, label, property)
                 else:
                     logger.info(
-                        'Output {:d},"{}", Not {}.'.format(
-                            output_number, label, property
-                        )
+                        'Output %d,"%s", Not %s.', output_number, label, property
                     )
                 self.homie_publish_property(
                     node_id=self.output_data[output_number]["machine_label"],
@@ -1620,7 +2330,7 @@ class Paradox:
 
     def update_output_label(self, output_number, label=None):
         if output_number > self.outputs or output_number < 1:
-            logger.error("Invalid output_number {:d}".format(output_number))
+            logger.error("Invalid output_number %d", output_number)
             return
         if label != None:
             if (
@@ -1628,16 +2338,15 @@ class Paradox:
                 or self.output_data[output_number]["label"] != label
             ):
                 self.output_data[output_number]["label"] = label
-                logger.info(
-                    'Output {:d} label set to "{}".'.format(output_number, label)
-                )
+                self.labels_changed = True
+                logger.info('Output %d label set to "%s".', output_number, label)
             self.eventmap.setoutputLabel(
                 output_number, self.output_data[output_number]["machine_label"]
             )
 
     def update_zone_property(self, zone_number, property="open", flag=None):
         if zone_number > self.zones or zone_number < 1:
-            logger.error("Invalid zone_number {:d}".format(zone_number))
+            logger.error("Invalid zone_number %d", zone_number)
             return
         if flag != None:
             if (
@@ -1647,24 +2356,22 @@ class Paradox:
                 label = self.zone_data[zone_number]["label"]
                 self.zone_data[zone_number][property] = flag
                 if flag:
-                    logger.info(
-                        'Zone {:d},"{}", {}.'.format(zone_number, label, property)
-                    )
+                    logger.info('Zone %d,"%s", %s.', zone_number, label, property)
                 else:
-                    logger.info(
-                        'Zone {:d},"{}", Not {}.'.format(zone_number, label, property)
-                    )
+                    logger.info('Zone %d,"%s", Not %s.', zone_number, label, property)
                 self.homie_publish_property(
                     node_id=self.zone_data[zone_number]["machine_label"],
                     property_id=property,
                     datatype="boolean",
                     value=flag,
                 )
+                if ZONE_BITMAP_ENABLED and property in ZONE_BITMAP_PROPERTIES:
+                    self.zone_bitmaps_dirty.add(property)
                 self.homie_publish_last_zone_event(zone_number, property)
 
     def update_trouble_indicator(self, trouble_number, flag=None):
         if trouble_number not in self.trouble_indicators:
-            logger.error("Invalid trouble_number {:d}".format(trouble_number))
+            logger.error("Invalid trouble_number %d", trouble_number)
         elif flag != None:
             if (
                 self.trouble_indicators[trouble_number]["status"] == None
@@ -1674,15 +2381,14 @@ class Paradox:
                 self.trouble_indicators[trouble_number]["status"] = flag
                 if flag:
                     logger.info(
-                        'Trouble {:d},"{}", {}.'.format(
-                            trouble_number, machine_label, "status"
-                        )
+                        'Trouble %d,"%s", %s.', trouble_number, machine_label, "status"
                     )
                 else:
                     logger.info(
-                        'Trouble {:d},"{}", Not {}.'.format(
-                            trouble_number, machine_label, "status"
-                        )
+                        'Trouble %d,"%s", Not %s.',
+                        trouble_number,
+                        machine_label,
+                        "status",
                     )
                 self.homie_publish_property(
                     node_id="troubleindicators",
@@ -1692,8 +2398,8 @@ class Paradox:
                 )
 
     def update_module_trouble_indicator(self, trouble_number, flag=None):
-        if trouble_number not in self.module.trouble_indicators:
-            logger.error("Invalid trouble_number {:d}".format(trouble_number))
+        if trouble_number not in self.module_trouble_indicators:
+            logger.error("Invalid trouble_number %d", trouble_number)
         elif flag != None:
             if (
                 self.module_trouble_indicators[trouble_number]["status"] == None
@@ -1705,15 +2411,17 @@ class Paradox:
                 self.module_trouble_indicators[trouble_number]["status"] = flag
                 if flag:
                     logger.info(
-                        'Module Trouble {:d},"{}", {}.'.format(
-                            trouble_number, machine_label, "status"
-                        )
+                        'Module Trouble %d,"%s", %s.',
+                        trouble_number,
+                        machine_label,
+                        "status",
                     )
                 else:
                     logger.info(
-                        'Module Trouble {:d},"{}", Not {}.'.format(
-                            trouble_number, machine_label, "status"
-                        )
+                        'Module Trouble %d,"%s", Not %s.',
+                        trouble_number,
+                        machine_label,
+                        "status",
                     )
                 self.homie_publish_property(
                     node_id="moduletroubleindicators",
@@ -1724,7 +2432,7 @@ class Paradox:
 
     def toggle_zone_property(self, zone_number, property="open"):
         if zone_number > self.zones or zone_number < 1:
-            logger.error("Invalid zone_number {:d}".format(zone_number))
+            logger.error("Invalid zone_number %d", zone_number)
             return
         self.update_zone_property(
             zone_number=zone_number,
@@ -1734,7 +2442,7 @@ class Paradox:
 
     def update_zone_label(self, zone_number, label=None):
         if zone_number > self.zones or zone_number < 1:
-            logger.error("Invalid zone_number {:d}".format(zone_number))
+            logger.error("Invalid zone_number %d", zone_number)
             return
         if label != None:
             if (
@@ -1742,7 +2450,8 @@ class Paradox:
                 or self.zone_data[zone_number]["label"] != label
             ):
                 self.zone_data[zone_number]["label"] = label
-                logger.info('Zone {:d} label set to "{}".'.format(zone_number, label))
+                self.labels_changed = True
+                logger.info('Zone %d label set to "%s".', zone_number, label)
             self.eventmap.setzoneLabel(
                 zone_number, self.zone_data[zone_number]["machine_label"]
             )
@@ -1762,11 +2471,11 @@ class Paradox:
             if subevent_number > 0 and subevent_number <= self.outputs:
                 self.update_output_label(output_number=subevent_number, label=label)
         else:
-            logger.error("Can't process label_type={:d} ".format(label_type))
+            logger.error("Can't process label_type=%d ", label_type)
 
     def update_user_label(self, user_number, label=None):
         if user_number > self.users or user_number < 1:
-            logger.error("Invalid user_number {:d}".format(user_number))
+            logger.error("Invalid user_number %d", user_number)
             return
         if label != None:
             if (
@@ -1774,14 +2483,15 @@ class Paradox:
                 or self.user_data[user_number]["label"] != label
             ):
                 self.user_data[user_number]["label"] = label
-                logger.info('User {:d} label set to "{}".'.format(user_number, label))
+                self.labels_changed = True
+                logger.info('User %d label set to "%s".', user_number, label)
             self.eventmap.setuserLabel(
                 user_number, self.user_data[user_number]["machine_label"]
             )
 
     def update_partition_label(self, partition_number, label=None):
         if partition_number > 2 or partition_number < 1:
-            logger.error("Invalid partition_number {:d}".format(partition_number))
+            logger.error("Invalid partition_number %d", partition_number)
             return
         if label != None:
             if (
@@ -1789,9 +2499,8 @@ class Paradox:
                 or self.partition_data[partition_number]["label"] != label
             ):
                 self.partition_data[partition_number]["label"] = label
-                logger.info(
-                    'Partition {:d} label set to "{}".'.format(partition_number, label)
-                )
+                self.labels_changed = True
+                logger.info('Partition %d label set to "%s".', partition_number, label)
 
     def process_low_nibble(self, low_nibble):
         softwaredirectconnected = test_bit(low_nibble, 0) == True
@@ -1824,6 +2533,7 @@ class Paradox:
                 logger.info("Software connected.")
             else:
                 logger.info("Software disconnected.")
+                self.scheduler.trigger("connect_software")
 
         if self.alarm != alarm:
             self.alarm = alarm
@@ -1857,10 +2567,10 @@ class Paradox:
             else:
                 logger.info("Event reporting disabled.")
 
-        logger.debug("software_direct connected: {0}".format(softwaredirectconnected))
-        logger.debug("Software connected: {0}".format(softwareconnected))
-        logger.debug("Alarm: {0}".format(alarm))
-        logger.debug("Event reporting: {0}".format(eventreporting))
+        logger.debug("software_direct connected: %s", softwaredirectconnected)
+        logger.debug("Software connected: %s", softwareconnected)
+        logger.debug("Alarm: %s", alarm)
+        logger.debug("Event reporting: %s", eventreporting)
 
     def check_time(self):
         now = datetime.now()
@@ -1868,12 +2578,12 @@ class Paradox:
             diff = abs(self.paneltime - now).total_seconds() / 60
         else:
             diff = UPDATE_ALARM_TIME_DIFF_MINUTES
-        logger.debug("PC time: {:%Y-%m-%d %H:%M}".format(now))
+        logger.debug("PC time: %s", now)
         if diff >= UPDATE_ALARM_TIME_DIFF_MINUTES:
-            logger.info("Time out by {:.1f} minutes.  Updating.".format(diff))
+            logger.info("Time out by %.1f minutes.  Updating.", diff)
             self.set_time()
         else:
-            logger.debug("Time out by {:.1f} minutes.  Close enough.".format(diff))
+            logger.debug("Time out by %.1f minutes.  Close enough.", diff)
 
     def process_panel_status_response(self, message):
         logger.debug("Processing Keep Alive Response...")
@@ -1895,7 +2605,7 @@ class Paradox:
                         datatype="string",
                         value=self.timestamp_str(self.paneltime),
                     )
-                    logger.debug("Panel time: {:%Y-%m-%d %H:%M}".format(self.paneltime))
+                    logger.debug("Panel time: %s", self.paneltime)
                 except:
                     self.paneltime = None
                 self.check_time()
@@ -1914,6 +2624,8 @@ class Paradox:
                         self.update_zone_property(
                             zone_number, property="open", flag=open
                         )
+                if self.softwareconnected:
+                    self.startup_mark("panel_status")
             elif panel_status == 1:
                 # Parition Status
                 for i in range(0, 2):
@@ -1926,89 +2638,14 @@ class Paradox:
                     arm_sleep = test_bit(message[17 + i * 4], 1)
                     arm_stay = test_bit(message[17 + i * 4], 2)
                     if arm_stay:
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armed",
-                            value=True,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstate",
-                            value=1,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatetext",
-                            value="STAY",
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatehass",
-                            value="armed_home",
-                        )
+                        state = "stay"
                     elif arm_sleep:
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armed",
-                            value=True,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstate",
-                            value=2,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatetext",
-                            value="SLEEP",
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatehass",
-                            value="armed_night",
-                        )
+                        state = "sleep"
                     elif arm:
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armed",
-                            value=True,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstate",
-                            value=3,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatetext",
-                            value="ARM",
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatehass",
-                            value="armed_away",
-                        )
+                        state = "arm"
                     else:
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armed",
-                            value=False,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstate",
-                            value=0,
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatetext",
-                            value="DISARM",
-                        )
-                        self.update_partition_property(
-                            partition_number=partition_number,
-                            property="armstatehass",
-                            value="disarmed",
-                        )
+                        state = "disarm"
+                    self.update_partition_arm_state(partition_number, state)
 
             elif panel_status == 2:
                 # Zone Bypass Status
@@ -2021,15 +2658,22 @@ class Paradox:
                 pass  # What do these do?
             else:
                 logger.error(
-                    "Invalid panel_statusuence {:d} on keep alive.".format(panel_status)
+                    "Invalid panel_statusuence %d on keep alive.", panel_status
                 )
         elif message[2] == 31 and message[3] == 224:
             logger.debug("Final keep alive response.")
         else:
-            logger.error("Can't process this keep alive response:{}".format(message))
+            logger.error("Can't process this keep alive response:%s", message)
+
+    def process_live_event_command(self, message, decode_seconds=None):
+        """Decode and handle a live event.
 
-    def process_live_event_command(self, message):
+        With metrics enabled decode_seconds is the frame decode time so far,
+        and the decode stage ends once the event itself is decoded.
+        """
         logger.debug("Processing live event command...")
+        if decode_seconds != None:
+            started = perf_counter()
         event_number = message[7]
         subevent_number = message[8]
         partition_number = message[9] + 1
@@ -2052,33 +2696,52 @@ class Paradox:
         )
         label_type = message[14]
         if event_timestamp:
-            logger.debug("Alarm timestamp: {:%Y-%m-%d %H:%M}".format(event_timestamp))
-        logger.debug("Partition number: {:d}".format(partition_number))
-        logger.debug("Module serial: {:d}".format(module_serial))
-        logger.debug("Label type: {:d}".format(label_type))
+            logger.debug("Alarm timestamp: %s", event_timestamp)
+        logger.debug("Partition number: %d", partition_number)
+        logger.debug("Module serial: %d", module_serial)
+        logger.debug("Label type: %d", label_type)
         logger.debug(
-            "event_number: {:d}, subevent_number {:d}".format(
-                event_number, subevent_number
-            )
+            "event_number: %d, subevent_number %d", event_number, subevent_number
         )
         label = message[15:31].decode("utf-8").strip()
         logger.debug(
-            "event_number: {:d}, subevent_number: {:d}, partition_number: {:d}, label_type: {:d}, label: {}".format(
-                event_number, subevent_number, partition_number, label_type, label
-            )
+            "event_number: %d, subevent_number: %d, partition_number: %d, label_type: %d, label: %s",
+            event_number,
+            subevent_number,
+            partition_number,
+            label_type,
+            label,
         )
         event, subevent = self.eventmap.getEventDescription(
             event_number, subevent_number
         )
         logger.info(
-            "partition_number: {:d}, event: {}, subevent {}".format(
-                partition_number, event, subevent
-            )
+            "partition_number: %d, event: %s, subevent %s",
+            partition_number,
+            event,
+            subevent,
         )
-        # self.publish_raw_event(partition_number, event_number, subevent_number)
         if label != None:
             if ord(label[0]) == 0 or len(label) == 0:
                 label = None
+        if decode_seconds != None:
+            self.metrics.observe("decode", decode_seconds + perf_counter() - started)
+        host_time = datetime.now().isoformat()
+        panel_time = None if event_timestamp == None else event_timestamp.isoformat()
+        if LIVE_EVENTS_ENABLED:
+            self.queue_live_event(
+                {
+                    "event": event_number,
+                    "subevent": subevent_number,
+                    "partition": partition_number,
+                    "event_description": event,
+                    "subevent_description": subevent,
+                    "label_type": label_type,
+                    "label": label,
+                    "panel_time": panel_time,
+                    "host_time": host_time,
+                }
+            )
         if label != None:
             self.update_label(
                 partition_number=partition_number,
@@ -2086,147 +2749,100 @@ class Paradox:
                 label_type=label_type,
                 label=label,
             )
-        logger.debug(
-            "event: {}, subevent: {}, label: {}".format(event, subevent, label)
+        logger.debug("event: %s, subevent: %s, label: %s", event, subevent, label)
+        if self.event_journal != None:
+            self.event_journal.append(
+                host_time=host_time,
+                panel_time=panel_time,
+                event=event_number,
+                subevent=subevent_number,
+                partition=partition_number,
+                zone=subevent_number
+                if self.eventmap.subEventGroupMap.get(event_number) == "_zoneLabel"
+                else None,
+                label_type=label_type,
+                label=label,
+                event_description=event,
+                subevent_description=subevent,
+            )
+        # Events read by keep alive, label or status page reads are not left
+        # waiting for the next pass of main_loop.
+        if self.pending_live_events:
+            self.flush_live_events()
+        actions = self.event_handlers.get(
+            event_handlers.handler_key(event_number, subevent_number)
+        )
+        if actions == None:
+            logger.debug("Nothing special to do for this event.")
+            return
+        if self.metrics.enabled:
+            started = perf_counter()
+            published = self.metrics.publish_seconds
+        for action, params in actions:
+            self.event_actions[action](
+                event_number, subevent_number, partition_number, params
+            )
+        if self.metrics.enabled:
+            published = self.metrics.publish_seconds - published
+            self.metrics.observe("update", perf_counter() - started - published)
+
+    def handle_status_page_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.request_status_page(params["page"])
+
+    def handle_zone_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.update_zone_property(
+            subevent_number, property=params["property"], flag=params["flag"]
         )
-        if event_number in (0, 1):  # Zone open
-            self.update_zone_property(
-                subevent_number, property="open", flag=event_number == 1
+
+    def handle_zone_toggle_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.toggle_zone_property(subevent_number, property=params["property"])
+
+    def handle_partition_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        for property, value in params["properties"]:
+            self.update_partition_property(
+                partition_number=partition_number, property=property, value=value
             )
-        elif event_number == 2:  # Partition status
-            if subevent_number in [2, 3, 4, 5, 6]:  # alarm subevents
-                self.update_partition_property(
-                    partition_number=partition_number, property="alarm", value=True
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatehass",
-                    value="triggered",
-                )
-            elif subevent_number == 7:  # Alarm stopped
-                self.update_partition_property(
-                    partition_number=partition_number, property="alarm", value=False
-                )
-            elif subevent_number == 11:  # Disarm partion
-                self.update_partition_property(
-                    partition_number=partition_number, property="armed", value=False
-                )
-                self.update_partition_property(
-                    partition_number=partition_number, property="armstate", value=0
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatetext",
-                    value="DISARM",
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatehass",
-                    value="disarmed",
-                )
 
-                self.update_partition_property(
-                    partition_number=partition_number, property="alarm", value=False
-                )
-                self.clear_on_disarm()
-            elif subevent_number == 12:  # Arm partion
-                # This is indication of arming of partition but not which type.
-                # Ignore this sub event as others will indicate the type
-                pass
-        elif event_number == 3:  # Bell status
-            if subevent_number in (0, 1):
-                self.update_bell(subevent_number == 1)
-            else:
-                pass  # we don't do anything with other bell events
-        elif event_number == 6:  # Non-reportable events
-            if subevent_number == 3:  # Arm in stay mode
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armed",
-                    value=True,
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstate",
-                    value=1,
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatetext",
-                    value="STAY",
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatehass",
-                    value="armed_home",
-                )
+    def handle_arm_state_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.update_partition_arm_state(partition_number, params["state"])
 
-            elif subevent_number == 4:  # Arm in sleep mode
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armed",
-                    value=True,
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstate",
-                    value=2,
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatetext",
-                    value="SLEEP",
-                )
-                self.update_partition_property(
-                    partition_number=partition_number,
-                    property="armstatehass",
-                    value="armed_night",
-                )
+    def handle_clear_on_disarm_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.clear_on_disarm()
 
-        elif event_number == 35:  # Zone bypass
-            self.toggle_zone_property(subevent_number, property="bypass")
-        elif event_number in (36, 38):  # Zone alarm
-            self.update_zone_property(
-                subevent_number, property="alarm", flag=event_number == 36
-            )
-        elif event_number in (37, 39):  # Zone fire alarm
-            self.update_zone_property(
-                subevent_number, property="firealarm", flag=event_number == 37
-            )
-        elif event_number == 41:  # Zone shutdown?
-            self.update_zone_property(subevent_number, property="shutdown", flag=True)
-        elif event_number in (42, 43):  # Zone tamper
-            self.update_zone_property(
-                subevent_number, property="tamper", flag=event_number == 42
-            )
-        elif event_number in (44, 45):  # Trouble
-            self.update_trouble_indicator(subevent_number, flag=event_number == 44)
-        elif event_number in (46, 47):  # Trouble
-            self.update_module_trouble_indicator(
-                subevent_number, flag=event_number == 46
-            )
-        elif event_number in (49, 50):  # Zone battery
-            self.update_zone_property(
-                subevent_number, property="lowbattery", flag=event_number == 49
-            )
-        elif event_number in (51, 52):  # Zone supervisiontrouble
-            self.update_zone_property(
-                subevent_number, property="supervisiontrouble", flag=event_number == 51
-            )
-        elif event_number in (53, 54):  # Wireless module supervisiontrouble
-            if subevent_number > 0 and subevent_number <= self.outputs:
-                self.update_output_property(
-                    subevent_number,
-                    property="supervisiontrouble",
-                    flag=event_number == 53,
-                )
-        elif event_number in (55, 56):  # Wireless module tamper trouble
-            if subevent_number > 0 and subevent_number <= self.outputs:
-                self.update_output_property(
-                    subevent_number, property="tamper", flag=event_number == 55
-                )
-        else:
-            logger.debug("Nothing special to do for this event.")
+    def handle_bell_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.update_bell(params["flag"])
+
+    def handle_trouble_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.update_trouble_indicator(subevent_number, flag=params["flag"])
+
+    def handle_module_trouble_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        self.update_module_trouble_indicator(subevent_number, flag=params["flag"])
+
+    def handle_output_event(
+        self, event_number, subevent_number, partition_number, params
+    ):
+        if subevent_number > 0 and subevent_number <= self.outputs:
+            self.update_output_property(
+                subevent_number, property=params["property"], flag=params["flag"]
+            )
 
     def process_start_communication_response(self, message):
         """Process start communication response to fetch panelid etc."""
@@ -2253,40 +2869,64 @@ class Paradox:
         if action == 16:  # Bypass action
             zone_number = message[3] + 1
             logger.debug(
-                "Bypass command received by panel for zone_number={:d}".format(
-                    zone_number
-                )
+                "Bypass command received by panel for zone_number=%d", zone_number
             )
             self.toggle_zone_property(zone_number=zone_number, property="bypass")
+            self.request_status_page(2)
         else:  # Unknown action response
             logger.error(
-                "Received unkown action on action_response from panel: {:d}".format(
-                    action
-                )
+                "Received unkown action on action_response from panel: %d", action
             )
 
     def process_message(self, message):
         """Process message."""
         logger.debug("Processing message...")
-        logger.debug("message[0]= {}".format(message[0]))
+        logger.debug("message[0]= %s", message[0])
         high_nibble, low_nibble = split_high_low_nibble(message[0])
-        logger.debug("High Nibble: {:d}".format(high_nibble))
-        logger.debug("Low Nibble: {:d}".format(low_nibble))
+        logger.debug("High Nibble: %d", high_nibble)
+        logger.debug("Low Nibble: %d", low_nibble)
 
+        metrics = self.metrics.enabled
+        decode_seconds = None
+        if metrics:
+            started = perf_counter()
         valid_checksum = self.verify_checksum(message)
+        if metrics:
+            decode_started = perf_counter()
+            self.metrics.observe("checksum", decode_started - started)
         if not valid_checksum:
             logger.warning(
                 "Message checksum fails.  Skipping message and flushing input buffer."
             )
-            self.connection.reset_input_buffer()
+            self.link_errors += 1
+            self.link_stats.checksum_failures += 1
+            self.link_stats.bytes_discarded += len(message)
+            if metrics:
+                self.metrics.inc("checksum_failures")
+                self.metrics.inc("bytes_discarded", value=len(message))
+            self.reset_input_buffer()
             return
+        self.last_frame_time = monotonic()
         self.messagetime = datetime.now()
-        self.homie_publish_property(
-            node_id="panel",
-            property_id="messagetime",
-            datatype="string",
-            value=self.timestamp_str(self.messagetime),
-        )
+        if metrics:
+            # Decoding ends here, before any update or publish, except for
+            # live events (see process_live_event_command).
+            decode_seconds = perf_counter() - decode_started
+            self.metrics.inc("frames", high_nibble)
+            if high_nibble != 14:
+                self.metrics.observe("decode", decode_seconds)
+        if (
+            self.messagetime_published == None
+            or self.last_frame_time - self.messagetime_published
+            >= MESSAGETIME_MIN_SECONDS
+        ):
+            self.messagetime_published = self.last_frame_time
+            self.homie_publish_property(
+                node_id="panel",
+                property_id="messagetime",
+                datatype="string",
+                value=self.timestamp_str(self.messagetime),
+            )
         if high_nibble != 15:
             self.process_low_nibble(low_nibble)
         if high_nibble == 0:  # Start communication response
@@ -2298,18 +2938,43 @@ class Paradox:
         elif high_nibble == 4:  # Action response
             self.process_action_response(message)
         elif high_nibble == 5:  # Keep Alive Response
-            self.process_panel_status_response(message)
+            if metrics:
+                started = perf_counter()
+                published = self.metrics.publish_seconds
+                self.process_panel_status_response(message)
+                published = self.metrics.publish_seconds - published
+                self.metrics.observe("update", perf_counter() - started - published)
+            else:
+                self.process_panel_status_response(message)
         elif high_nibble == 7:  # Error & disconnect  message from panel
             logger.error("Panel sent an error message and/or disconnected.")
+            self.link_errors += 1
         elif high_nibble == 14:  # Live Event command, not sure about 15
-            self.process_live_event_command(message)
+            self.process_live_event_command(message, decode_seconds)
         else:
             logger.error(
-                "Could not process message: {} (high_nibble={:d})".format(
-                    message, high_nibble
-                )
+                "Could not process message: %s (high_nibble=%d)", message, high_nibble
             )
-            self.connection.reset_input_buffer()
+            self.reset_input_buffer()
+
+    def reset_input_buffer(self):
+        discarded = self.connection.in_waiting()
+        self.link_stats.bytes_discarded += discarded
+        if self.metrics.enabled:
+            self.metrics.inc("input_buffer_flushes")
+            self.metrics.inc("bytes_discarded", value=discarded)
+        self.connection.reset_input_buffer()
+
+    def reply_timed_out(self, message, retry):
+        """Count a request that got no reply, and whether it is sent again."""
+        self.link_errors += 1
+        self.link_stats.reply_timeout(message)
+        if retry:
+            self.link_stats.retries += 1
+        if self.metrics.enabled:
+            self.metrics.inc("reply_timeouts", command_type(message))
+            if retry:
+                self.metrics.inc("retries")
 
     def send_message(self, message):
         """Send a message."""
@@ -2317,8 +2982,9 @@ class Paradox:
         if checksum:
             message += bytearray([checksum])
 
-        logger.debug("Sending message {}...".format(message))
+        logger.debug("Sending message %s...", message)
         self.connection.write(message)
+        self.link_stats.sent(message)
         logger.debug("Message sent.")
 
     def send_and_process_reply(self, message, tries=3):
@@ -2329,6 +2995,8 @@ class Paradox:
             self.send_message(message)
             reply = self.wait_for_message()
             attempts += 1
+            if reply == None:
+                self.reply_timed_out(message, retry=attempts < tries)
         if reply != None:
             self.process_message(reply)
         return reply
@@ -2341,6 +3009,8 @@ class Paradox:
             self.send_message(message)
             reply = self.wait_for_message()
             attempts += 1
+            if reply == None:
+                self.reply_timed_out(message, retry=attempts < tries)
         return reply
 
     def calc_checksum(self, message):
@@ -2354,15 +3024,13 @@ class Paradox:
             return checksum
         else:
             logger.debug(
-                "Message not 36 byes.  Cannot calculate checksum. Message: {}".format(
-                    message
-                )
+                "Message not 36 byes.  Cannot calculate checksum. Message: %s", message
             )
             return None
 
     def verify_checksum(self, message):
         if len(message) != 37:
-            logger.debug("Message not 37 byes.  Message: {}".format(message))
+            logger.debug("Message not 37 byes.  Message: %s", message)
             return False
         checksum = self.calc_checksum(message[:36])
         return checksum == message[36]
@@ -2381,6 +3049,9 @@ class Paradox:
 
         message = b"\x5f\x20\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00"
         reply = self.send_and_process_reply(message)
+        if reply == None:
+            logger.error("No reply to start communication, not connected.")
+            return False
 
         # message = reply
         message = (
@@ -2402,7 +3073,7 @@ class Paradox:
         reply = self.send_and_process_reply(message)
 
         self.softwareconnected = True
-        self.connection.reset_input_buffer()
+        self.reset_input_buffer()
         return True
 
     def set_time(self):
@@ -2422,167 +3093,351 @@ class Paradox:
         message = message.ljust(36, b"\x00")
         self.send_message(message)
 
+    def request_status_page(self, page):
+        """Request status page on the next keep alive."""
+        self.status_pages[page]["stale"] = True
+
+    def status_pages_due(self):
+        """Return status pages to request on this keep alive and reschedule them."""
+        now = monotonic()
+        healthy = (
+            self.eventreporting and self.link_errors == self.keep_alive_link_errors
+        )
+        self.keep_alive_link_errors = self.link_errors
+        pages = []
+        for page in sorted(self.status_pages):
+            status_page = self.status_pages[page]
+            if status_page["policy"] == "adaptive" and not healthy:
+                status_page["interval"] = KEEP_ALIVE_SECONDS
+            if status_page["stale"] or not healthy or now >= status_page["due"]:
+                pages.append(page)
+                status_page["stale"] = False
+                if status_page["policy"] == "adaptive" and healthy:
+                    status_page["interval"] = min(
+                        status_page["interval"] * STATUS_POLL_BACKOFF_FACTOR,
+                        STATUS_POLL_MAX_SECONDS,
+                    )
+                status_page["due"] = now + status_page["interval"]
+        logger.debug("Status pages due: %s (healthy=%s)", pages, healthy)
+        return pages
+
+    def read_status_pages_pipelined(self, pages, tries=3, timeout=1):
+        """Request status pages keeping up to keep_alive_pipeline_depth requests
+        outstanding and process replies as they arrive."""
+        base_message = b"\x50\x00\x80"
+        pending = list(pages)
+        attempts = {page: 0 for page in pages}
+        outstanding = {}  # page: reply deadline
+        while pending or outstanding:
+            while pending and len(outstanding) < self.keep_alive_pipeline_depth:
+                page = pending.pop(0)
+                message = (base_message + bytes([page])).ljust(36, b"\x00")
+                self.send_message(message)
+                attempts[page] += 1
+                outstanding[page] = monotonic() + timeout
+            wait = max(0, min(outstanding.values()) - monotonic())
+            reply = self.wait_for_message(timeout=wait)
+            if reply != None:
+                if (
+                    self.verify_checksum(reply)
+                    and reply[0] >> 4 == 5
+                    and reply[2] == 128
+                    and reply[3] in outstanding
+                ):
+                    del outstanding[reply[3]]
+                self.process_message(reply)
+            now = monotonic()
+            for page in [page for page in outstanding if outstanding[page] <= now]:
+                del outstanding[page]
+                self.reply_timed_out(
+                    (base_message + bytes([page])).ljust(36, b"\x00"),
+                    retry=attempts[page] < tries,
+                )
+                if attempts[page] < tries:
+                    pending.insert(0, page)
+                else:
+                    logger.warning("No reply for status page %d.", page)
+
     def keep_alive(self):
+        if not self.softwareconnected:
+            return
         logger.debug("Sending keep alive messages...")
-        base_message = b"\x50\x00\x80"
-        for i in range(0, 7):
-            message = (base_message + bytes([i])).ljust(36, b"\x00")
-            self.wait_for_message(timeout=0.1, process_message=True)
-            self.send_and_process_reply(message)
-        sleep(0.1)
+        started = monotonic()
+        pages = self.status_pages_due()
+        if self.keep_alive_pipeline_depth > 1:
+            self.read_status_pages_pipelined(pages)
+        else:
+            base_message = b"\x50\x00\x80"
+            for page in pages:
+                message = (base_message + bytes([page])).ljust(36, b"\x00")
+                self.wait_for_message(timeout=0.1, process_message=True)
+                self.send_and_process_reply(message)
+            sleep(0.1)
         message = b"\x50\x00\x1f\xe0".ljust(36, b"\x00") + b"\x4f"
         self.send_and_process_reply(message)
+        self.keep_alive_seconds = monotonic() - started
+        if self.metrics.enabled:
+            self.metrics.observe("keep_alive", self.keep_alive_seconds)
         logger.debug("Keep alive done.")
 
-    def read_zone_labels(self):
-        logger.info("Reading zone labels...")
-        register_dict = getattr(self.registermap, "get" + "zoneLabel" + "Register")()
-        for i in range(0, int(self.zones / 2)):
-            self.wait_for_message(timeout=0.1, process_message=True)
-            message = bytearray(register_dict[i * 2 + 1]["Send"], encoding="latin")
-            message = message.ljust(36, b"\x00")
-            reply = self.send_and_wait_for_reply(message)
-            logger.debug("Label packet: {}".format(reply))
-            if reply != None:
-                try:
-                    label = reply[4:20].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if ord(label[0]) == 0 or len(label) == 0:
-                        label = None
-                self.update_zone_label(zone_number=i * 2 + 1, label=label)
-                try:
-                    label = reply[20:36].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if ord(label[0]) == 0 or len(label) == 0:
-                        label = None
-                self.update_zone_label(zone_number=i * 2 + 2, label=label)
-        logger.info("Read zone labels.")
-
-    def read_user_labels(self):
-        logger.info("Reading user labels...")
-        register_dict = getattr(self.registermap, "get" + "userLabel" + "Register")()
-        for i in range(0, int(self.users / 2)):
-            sleep(0.1)
-            message = bytearray(register_dict[i * 2 + 1]["Send"], encoding="latin")
-            message = message.ljust(36, b"\x00")
-            reply = self.send_and_wait_for_reply(message)
-            logger.debug("Label packet: {}".format(reply))
-            if reply != None:
-                try:
-                    label = reply[4:20].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if ord(label[0]) == 0 or len(label) == 0:
-                        label = None
-                self.update_user_label(user_number=i * 2 + 1, label=label)
-                try:
-                    label = reply[20:36].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if ord(label[0]) == 0 or len(label) == 0:
-                        label = None
-                self.update_user_label(user_number=i * 2 + 2, label=label)
-        logger.info("Read user labels.")
-
-    def read_partition_labels(self):
-        logger.info("Reading partition labels...")
-        register_dict = getattr(
-            self.registermap, "get" + "partitionLabel" + "Register"
-        )()
-        for i in range(0, 1):
-            self.wait_for_message(timeout=0.1, process_message=True)
-            message = bytearray(register_dict[i * 2 + 1]["Send"], encoding="latin")
-            message = message.ljust(36, b"\x00")
-            reply = self.send_and_wait_for_reply(message)
-            logger.debug("Label packet: {}".format(reply))
-            if reply != None:
-                try:
-                    label = reply[4:20].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if ord(label[0]) == 0 or len(label) == 0:
-                        label = None
-                self.update_partition_label(partition_number=i * 2 + 1, label=label)
-                try:
-                    label = reply[20:36].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if ord(label[0]) == 0 or len(label) == 0:
-                        label = None
-                self.update_partition_label(partition_number=i * 2 + 2, label=label)
-        logger.info("Read partition labels.")
-
-    def read_output_labels(self):
-        logger.info("Reading output labels...")
-        register_dict = getattr(self.registermap, "get" + "outputLabel" + "Register")()
-        for i in range(0, int(self.outputs / 2)):
-            self.wait_for_message(timeout=0.1, process_message=True)
-            message = bytearray(register_dict[i * 2 + 1]["Send"], encoding="latin")
-            message = message.ljust(36, b"\x00")
-            reply = self.send_and_wait_for_reply(message)
-            logger.debug("Label packet: {}".format(reply))
-            if reply != None:
-                try:
-                    label = reply[4:20].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if type(label) != "str":
-                        label = None
-                    elif len(label) == 0:
-                        label = None
-                self.update_output_label(output_number=i * 2 + 1, label=label)
-                try:
-                    label = reply[20:36].decode("utf-8").strip()
-                except:
-                    logger.error(
-                        "Could not extract label from message {}.".format(reply)
-                    )
-                    label = None
-                if label != None:
-                    if type(label) != "str":
-                        label = None
-                    elif len(label) == 0:
-                        label = None
-                self.update_output_label(output_number=i * 2 + 2, label=label)
-        logger.info("Read output labels.")
-
-    def read_labels(self):
-        logger.info("Reading all labels...")
-        self.read_zone_labels()
-        self.read_user_labels()
-        self.read_partition_labels()
-        self.read_output_labels()
-        logger.info("Read all labels.")
+    def extract_label(self, reply, start, finish):
+        """Return the label in reply[start:finish] or None if there is none."""
+        try:
+            label = reply[start:finish].decode("utf-8").strip()
+        except:
+            logger.error("Could not extract label from message %s.", reply)
+            return None
+        if len(label) == 0 or ord(label[0]) == 0:
+            return None
+        return label
+
+    def update_label_item(self, item, number, label=None):
+        if item == "zoneLabel":
+            self.update_zone_label(zone_number=number, label=label)
+        elif item == "userLabel":
+            self.update_user_label(user_number=number, label=label)
+        elif item == "partitionLabel":
+            self.update_partition_label(partition_number=number, label=label)
+        elif item == "outputLabel":
+            self.update_output_label(output_number=number, label=label)
+        else:
+            logger.error("Can't update label item %s.", item)
+
+    def read_label_block(self, item, number):
+        """Read the register block holding labels number and number + 1."""
+        register_dict = getattr(self.registermap, "get" + item + "Register")()
+        message = bytearray(register_dict[number]["Send"], encoding="latin")
+        message = message.ljust(36, b"\x00")
+        reply = self.send_and_wait_for_reply(message)
+        logger.debug("Label packet: %s", reply)
+        if reply != None:
+            label = self.extract_label(reply, 4, 20)
+            self.update_label_item(item, number, label=label)
+            label = self.extract_label(reply, 20, 36)
+            self.update_label_item(item, number + 1, label=label)
+        return reply
+
+    def read_next_label_block(self):
+        """Read one label register block per call, cycling through all labels.
+
+        Skips the slot if the panel is talking to us or we are not connected.
+        After a full sweep the labels are cached and Homie is re-initialised if
+        any changed, then the next sweep starts after READ_LABELS_SECONDS.
+        """
+        if not self.softwareconnected or self.connection.in_waiting() > 0:
+            return
+        item, number = self.label_blocks[self.label_block_index]
+        self.read_label_block(item, number)
+        self.label_block_index += 1
+        if self.label_block_index >= len(self.label_blocks):
+            self.label_block_index = 0
+            logger.info("Read all labels.")
+            if self.labels_changed:
+                self.save_label_cache()
+                self.scheduler.trigger("homie_init")
+                self.labels_changed = False
+            self.scheduler.schedule("labels", monotonic() + READ_LABELS_SECONDS)
+
+    def label_cache(self):
+        """Labels as stored in the label cache file."""
+        return {
+            "zoneLabel": {
+                i: self.zone_data[i]["label"] for i in range(1, self.zones + 1)
+            },
+            "userLabel": {
+                i: self.user_data[i]["label"] for i in range(1, self.users + 1)
+            },
+            "partitionLabel": {
+                i: self.partition_data[i]["label"] for i in range(1, 2 + 1)
+            },
+            "outputLabel": {
+                i: self.output_data[i]["label"] for i in range(1, self.outputs + 1)
+            },
+        }
+
+    def load_label_cache(self):
+        if self.label_cache_file == None:
+            return
+        try:
+            with open(self.label_cache_file) as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            logger.info("No label cache {}.".format(self.label_cache_file))
+            return
+        except Exception as e:
+            logger.error("Could not read label cache: {}".format(e))
+            return
+        logger.info("Loading labels from {}.".format(self.label_cache_file))
+        for item in cache:
+            for number in cache[item]:
+                self.update_label_item(item, int(number), label=cache[item][number])
+        self.labels_changed = False
+
+    def save_label_cache(self):
+        if self.label_cache_file == None:
+            return
+        logger.info("Saving labels to {}.".format(self.label_cache_file))
+        try:
+            with open(self.label_cache_file + ".tmp", "w") as f:
+                json.dump(self.label_cache(), f, indent=1)
+            os.replace(self.label_cache_file + ".tmp", self.label_cache_file)
+        except Exception as e:
+            logger.error("Could not write label cache: {}".format(e))
+
+    def state_snapshot(self):
+        """Panel, partition, zone, output and trouble state for the snapshot file."""
+        return {
+            "time": datetime.now().isoformat(),
+            "panel": {a: getattr(self, a) for a in SNAPSHOT_PANEL_ATTRIBUTES},
+            "partitions": {
+                i: {p: self.partition_data[i][p] for p in SNAPSHOT_PARTITION_PROPERTIES}
+                for i in range(1, 2 + 1)
+            },
+            "zones": {
+                i: {p: self.zone_data[i][p] for p in SNAPSHOT_ZONE_PROPERTIES}
+                for i in range(1, self.zones + 1)
+            },
+            "outputs": {
+                i: {p: self.output_data[i][p] for p in SNAPSHOT_OUTPUT_PROPERTIES}
+                for i in range(1, self.outputs + 1)
+            },
+            "troubleindicators": {
+                t: self.trouble_indicators[t]["status"] for t in self.trouble_indicators
+            },
+            "moduletroubleindicators": {
+                t: self.module_trouble_indicators[t]["status"]
+                for t in self.module_trouble_indicators
+            },
+        }
+
+    def load_state_snapshot(self):
+        if self.state_snapshot_file == None:
+            return
+        try:
+            with open(self.state_snapshot_file) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            logger.info("No state snapshot {}.".format(self.state_snapshot_file))
+            return
+        except Exception as e:
+            logger.error("Could not read state snapshot: {}".format(e))
+            return
+        try:
+            state = self.parse_state_snapshot(snapshot)
+        except Exception as e:
+            logger.error(
+                "Ignoring invalid state snapshot {}: {}".format(
+                    self.state_snapshot_file, e
+                )
+            )
+            return
+        if state == None:
+            return
+        logger.info(
+            "Restoring provisional state from {} ({}).".format(
+                self.state_snapshot_file, snapshot["time"]
+            )
+        )
+        panel, partitions, zones, outputs, troubles, module_troubles = state
+        for key, value in panel.items():
+            setattr(self, key, value)
+        for i, partition in partitions.items():
+            self.partition_data[i].update(partition)
+        for i, zone in zones.items():
+            self.zone_data[i].update(zone)
+        for i, output in outputs.items():
+            self.output_data[i].update(output)
+        for t, status in troubles.items():
+            self.trouble_indicators[t]["status"] = status
+        for t, status in module_troubles.items():
+            self.module_trouble_indicators[t]["status"] = status
+
+    def parse_state_snapshot(self, snapshot):
+        """Validate snapshot and return the state to restore, or None if too old.
+
+        Only the state written by state_snapshot is accepted and everything is
+        checked before any of it is restored, so an invalid file raises without
+        changing anything.
+        """
+        age = (
+            datetime.now() - datetime.fromisoformat(snapshot["time"])
+        ).total_seconds()
+        if age > STATE_SNAPSHOT_MAX_AGE_SECONDS:
+            logger.info("State snapshot from {} is too old.".format(snapshot["time"]))
+            return None
+        skip = ()
+        if age > STATE_SNAPSHOT_ARM_MAX_AGE_SECONDS:
+            logger.info(
+                "Not restoring arm and alarm state from {}.".format(snapshot["time"])
+            )
+            skip = SNAPSHOT_ARM_ALARM_STATE
+
+        def checked(data):
+            if not isinstance(data, dict):
+                raise ValueError("expected an object, got {!r}".format(data))
+            for name, value in data.items():
+                if value != None and not isinstance(value, (bool, int, float, str)):
+                    raise ValueError("bad value {!r} for {}".format(value, name))
+            return data
+
+        def values(data, names):
+            restored = {}
+            for name, value in checked(data).items():
+                if name not in names:
+                    raise ValueError("unexpected state {!r}".format(name))
+                if name not in skip:
+                    restored[name] = value
+            return restored
+
+        def numbered(data, numbers, names):
+            restored = {}
+            if not isinstance(data, dict):
+                raise ValueError("expected an object, got {!r}".format(data))
+            for i, item in data.items():
+                if int(i) in numbers:
+                    restored[int(i)] = values(item, names)
+            return restored
+
+        def statuses(data, indicators):
+            return {
+                int(t): status
+                for t, status in checked(data).items()
+                if int(t) in indicators
+            }
+
+        return (
+            values(snapshot["panel"], SNAPSHOT_PANEL_ATTRIBUTES),
+            numbered(
+                snapshot["partitions"], range(1, 2 + 1), SNAPSHOT_PARTITION_PROPERTIES
+            ),
+            numbered(
+                snapshot["zones"], range(1, self.zones + 1), SNAPSHOT_ZONE_PROPERTIES
+            ),
+            numbered(
+                snapshot["outputs"],
+                range(1, self.outputs + 1),
+                SNAPSHOT_OUTPUT_PROPERTIES,
+            ),
+            statuses(snapshot["troubleindicators"], self.trouble_indicators),
+            statuses(
+                snapshot["moduletroubleindicators"], self.module_trouble_indicators
+            ),
+        )
+
+    def save_state_snapshot(self):
+        """Write the state snapshot if anything but its time changed."""
+        snapshot = self.state_snapshot()
+        state = json.dumps({k: v for k, v in snapshot.items() if k != "time"})
+        if state == self.state_snapshot_saved:
+            return
+        logger.debug("Saving state snapshot to %s.", self.state_snapshot_file)
+        try:
+            with open(self.state_snapshot_file + ".tmp", "w") as f:
+                json.dump(snapshot, f)
+            os.replace(self.state_snapshot_file + ".tmp", self.state_snapshot_file)
+            self.state_snapshot_saved = state
+        except Exception as e:
+            logger.error("Could not write state snapshot: {}".format(e))
 
     def set_output(self, output_number, on=True, stop_pulse=True):
         if on:
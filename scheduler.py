@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+import logging
+import heapq
+import threading
+from time import monotonic
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+
+class Scheduler:
+    def __init__(self, wakeup=None):
+        """Initialise Scheduler.
+
+        Tasks are kept on a heap of monotonic deadlines so that wall clock
+        adjustments (NTP, set_time) do not affect when they run.  wakeup is
+        called after a trigger to interrupt the main loop's wait.
+        """
+        logger.debug("Initialising Scheduler...")
+        self.tasks = {}
+        self.heap = []
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.wakeup = wakeup
+        logger.debug("Initialised Scheduler.")
+
+    def add(self, name, interval, callback, delay=0):
+        """Add a task that runs callback every interval seconds, first after delay."""
+        self.tasks[name] = {"interval": interval, "callback": callback, "due": None}
+        self.schedule(name, monotonic() + delay)
+
+    def schedule(self, name, due):
+        """Set the next deadline of a task."""
+        with self.lock:
+            task = self.tasks[name]
+            task["due"] = due
+            self.sequence += 1
+            heapq.heappush(self.heap, (due, self.sequence, name))
+
+    def trigger(self, name):
+        """Make a task due now and wake the main loop.
+
+        Safe to call from other threads.
+        """
+        if name in self.tasks:
+            self.schedule(name, monotonic())
+            if self.wakeup != None:
+                self.wakeup()
+
+    def time_until_next(self, maximum=None):
+        """Seconds until the next task is due (0 if one is overdue)."""
+        with self.lock:
+            self.discard_stale()
+            if not self.heap:
+                return maximum
+            wait = max(0, self.heap[0][0] - monotonic())
+        if maximum != None:
+            wait = min(wait, maximum)
+        return wait
+
+    def discard_stale(self):
+        """Drop heap entries superseded by a later schedule or trigger."""
+        while self.heap:
+            due, sequence, name = self.heap[0]
+            task = self.tasks.get(name)
+            if task != None and task["due"] == due:
+                return
+            heapq.heappop(self.heap)
+
+    def run_pending(self):
+        """Run every task that is due.
+
+        An overdue task runs once and its next deadline is never placed in the
+        past, so a long blocking call does not cause a burst of catch-up runs.
+        """
+        now = monotonic()
+        while True:
+            with self.lock:
+                self.discard_stale()
+                if not self.heap or self.heap[0][0] > now:
+                    break
+                due, sequence, name = heapq.heappop(self.heap)
+                task = self.tasks[name]
+                task["due"] = None
+            task["callback"]()
+            if task["due"] == None:
+                now = monotonic()
+                next_due = due + task["interval"]
+                if next_due <= now:
+                    next_due = now + task["interval"]
+                self.schedule(name, next_due)
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 import logging
+import os
+import select
 import serial
+from time import monotonic, sleep
 
 logger = logging.getLogger("paradox_mqtt").getChild(__name__)
 
@@ -14,27 +17,38 @@ class Serial_Connection:
         self.baudrate = baudrate
         self.timeout = timeout
         self.rtscts = rtscts
+        # Self-pipe so another thread can interrupt wait_for_bytes.
+        self.wakeup_read, self.wakeup_write = os.pipe()
+        os.set_blocking(self.wakeup_read, False)
+        os.set_blocking(self.wakeup_write, False)
         logger.debug("Initialised Serial_Connection.")
 
     def connect(self):
         """Connect to serial port."""
         logger.debug("Connecting to serial port...")
-        self.connection = serial.Serial(
-            port=self.port,
-            baudrate=self.baudrate,
-            timeout=self.timeout,
-            rtscts=self.rtscts,
-        )
         try:
-            self.connection.open()
-            logger.debug("Connected to serial port.")
+            self.connection = serial.Serial(
+                port=self.port,
+                baudrate=self.baudrate,
+                timeout=self.timeout,
+                rtscts=self.rtscts,
+            )
+            logger.info("Connected to serial port.")
             return True
-        except:
-            logger.error("Could not connect to serial port.")
+        except Exception as e:
+            logger.error("Could not connect to serial port: {}".format(e))
+            self.connection = None
             return False
 
+    def is_connected(self):
+        """Check if the serial port is open."""
+        return self.connection != None and self.connection.is_open
+
     def write(self, data):
         """Write data to serial port."""
+        if not self.is_connected():
+            logger.error("Serial port not connected.  Dropping message.")
+            return
         self.connection.write(data)
 
     def read(self, bytes=37, timeout=1):
@@ -45,12 +59,62 @@ class Serial_Connection:
         self.connection.timeout = old_timeout
         return data
 
+    def wait_for_bytes(self, bytes=37, timeout=1):
+        """Block until bytes are waiting on connection or timeout expires.
+
+        Returns True if enough bytes are waiting.  Sleeps on the port instead
+        of polling so an idle link costs no CPU.  Returns False early when
+        wakeup is called.
+        """
+        if not self.is_connected():
+            if select.select([self.wakeup_read], [], [], timeout)[0]:
+                self.drain_wakeup()
+            return False
+        deadline = monotonic() + timeout
+        while True:
+            waiting = self.in_waiting()
+            if waiting >= bytes:
+                return True
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            if waiting > 0:
+                # Part of a frame has arrived, wait for the rest of it
+                # (10 bits per byte on the line).
+                sleep(min(remaining, (bytes - waiting) * 10.0 / self.baudrate))
+            else:
+                readable = select.select(
+                    [self.connection, self.wakeup_read], [], [], remaining
+                )[0]
+                if self.wakeup_read in readable:
+                    self.drain_wakeup()
+                    return self.in_waiting() >= bytes
+
+    def wakeup(self):
+        """Interrupt wait_for_bytes.  Safe to call from other threads."""
+        try:
+            os.write(self.wakeup_write, b"\x00")
+        except BlockingIOError:
+            pass  # pipe full, a wakeup is already pending
+
+    def drain_wakeup(self):
+        """Clear pending wakeups."""
+        try:
+            while os.read(self.wakeup_read, 512):
+                pass
+        except BlockingIOError:
+            pass
+
     def in_waiting(self):
         """Check how many butes are waiting on connection."""
+        if not self.is_connected():
+            return 0
         return self.connection.in_waiting
 
     def reset_input_buffer(self):
         """Clear input buffer."""
+        if not self.is_connected():
+            return
         return self.connection.reset_input_buffer()
 
     def reset_output_buffer(self):
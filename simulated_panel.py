@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+import logging
+import threading
+from time import monotonic
+
+logger = logging.getLogger("paradox_mqtt").getChild(__name__)
+
+
+class SimulatedPanel:
+    """In-memory stand in for Serial_Connection talking to an MG5050.
+
+    Models the serial line (10 bits per byte in each direction), a panel that
+    answers one request at a time after response_time seconds and ignores
+    requests while max_outstanding requests are already queued.
+    """
+
+    def __init__(
+        self,
+        baudrate=9600,
+        response_time=0.05,
+        max_outstanding=4,
+        panelid=65,
+    ):
+        """Initialise SimulatedPanel."""
+        logger.debug("Initialising SimulatedPanel...")
+        self.baudrate = baudrate
+        self.byte_time = 10.0 / baudrate
+        self.response_time = response_time
+        self.max_outstanding = max_outstanding
+        self.panelid = panelid
+        self.condition = threading.Condition()
+        self.frames = []  # [available time, frame]
+        self.transmit_free = 0  # panel to host line free from
+        self.receive_free = 0  # host to panel line free from
+        self.panel_free = 0  # panel finished previous request
+        self.outstanding = []  # reply times of queued requests
+        self.low_nibble = 0x08  # event reporting
+        self.zone_open = 0
+        self.zone_bypass = 0
+        self.requests = 0
+        self.dropped = 0
+        self.bytes_read = 0
+        self.live_events = []  # [available time, event, subevent, partition]
+        self.woken = False
+        logger.debug("Initialised SimulatedPanel.")
+
+    def frame(self, data):
+        """Pad data to 36 bytes and append a checksum."""
+        data = bytes(data).ljust(36, b"\x00")
+        return data + bytes([sum(data) % 256])
+
+    def queue_frame(self, frame, ready):
+        """Queue frame for the host once ready and transmitted.
+
+        Returns the time the frame is available to the host.
+        """
+        with self.condition:
+            start = max(ready, self.transmit_free)
+            self.transmit_free = start + len(frame) * self.byte_time
+            self.frames.append([self.transmit_free, frame])
+            self.condition.notify_all()
+            return self.transmit_free
+
+    def reply(self, message):
+        """Build the panel reply for a host request (or None)."""
+        command = message[0]
+        if command == 0x72:  # Initialize
+            return self.frame([0x10 | self.low_nibble])
+        if command == 0x5F:  # Start communication
+            self.low_nibble |= 0x02  # software connected
+            return self.frame([0x00 | self.low_nibble, 0, 0, 0, self.panelid, 4, 1, 2])
+        if command >> 4 == 0:  # Initialize communication
+            self.low_nibble |= 0x02  # software connected
+            return self.frame([0x10 | self.low_nibble])
+        if command == 0x30:  # Set time
+            return self.frame([0x30 | self.low_nibble])
+        if command == 0x40:  # Action
+            if message[2] == 0x10:  # Bypass
+                self.zone_bypass ^= 1 << message[3]
+            return self.frame([0x40 | self.low_nibble, message[2], message[3]])
+        if command == 0x50 and message[2] == 0x80:  # Status page
+            return self.status_page(message[3])
+        if command == 0x50:  # EEPROM read, returns two labels
+            address = "{:02x}{:02x}".format(message[2], message[3])
+            labels = "Label {} a".format(address).ljust(16)
+            labels += "Label {} b".format(address).ljust(16)
+            return self.frame(
+                [0x50 | self.low_nibble, 0, message[2], message[3]]
+                + list(labels.encode("utf-8"))
+            )
+        return None
+
+    def status_page(self, page):
+        data = bytearray(36)
+        data[0] = 0x50 | self.low_nibble
+        data[2] = 0x80
+        data[3] = page
+        if page == 0:
+            data[9:15] = bytes([20, 26, 1, 1, 0, 0])
+            data[15:18] = bytes([180, 150, 140])
+            data[19:23] = self.zone_open.to_bytes(4, "little")
+        elif page == 2:
+            for i in range(32):
+                data[4 + i] = 0x08 if self.zone_bypass >> i & 1 else 0
+        return self.frame(data)
+
+    def live_event(self, event_number, subevent_number, partition_number=0):
+        """Queue a live event frame from the panel."""
+        if event_number in (0, 1):
+            if event_number == 1:
+                self.zone_open |= 1 << (subevent_number - 1)
+            else:
+                self.zone_open &= ~(1 << (subevent_number - 1))
+        data = [0xE0 | self.low_nibble, 20, 26, 1, 1, 0, 0]
+        data += [event_number, subevent_number, partition_number]
+        data += [0, 0, 0, 0, 0]
+        data += list("Zone {:d}".format(subevent_number).ljust(16).encode("utf-8"))
+        with self.condition:  # reentrant, keeps live_events in frame order
+            available = self.queue_frame(self.frame(data), monotonic())
+            self.live_events.append(
+                [available, event_number, subevent_number, partition_number]
+            )
+
+    # Serial_Connection interface
+
+    def connect(self):
+        return True
+
+    def is_connected(self):
+        return True
+
+    def write(self, data):
+        """Receive a request from the host."""
+        now = monotonic()
+        with self.condition:
+            self.requests += 1
+            start = max(now, self.receive_free)
+            self.receive_free = start + len(data) * self.byte_time
+            self.outstanding = [t for t in self.outstanding if t > now]
+            if len(self.outstanding) >= self.max_outstanding:
+                self.dropped += 1
+                return
+            reply = self.reply(bytes(data))
+            if reply == None:
+                return
+            ready = max(self.receive_free, self.panel_free) + self.response_time
+            self.panel_free = ready
+            self.outstanding.append(ready)
+        self.queue_frame(reply, ready)
+
+    def available(self):
+        now = monotonic()
+        return sum(len(f[1]) for f in self.frames if f[0] <= now)
+
+    def read(self, bytes=37, timeout=1):
+        """Return up to bytes of received frames."""
+        self.wait_for_bytes(bytes, timeout)
+        with self.condition:
+            now = monotonic()
+            data = b""
+            while self.frames and self.frames[0][0] <= now and len(data) < bytes:
+                frame = self.frames[0][1]
+                take = bytes - len(data)
+                data += frame[:take]
+                if take >= len(frame):
+                    self.frames.pop(0)
+                else:
+                    self.frames[0][1] = frame[take:]
+            self.bytes_read += len(data)
+            return data
+
+    def in_waiting(self):
+        with self.condition:
+            return self.available()
+
+    def wait_for_bytes(self, bytes=37, timeout=1):
+        deadline = monotonic() + timeout
+        with self.condition:
+            while self.available() < bytes:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return False
+                pending = [f[0] for f in self.frames if f[0] > monotonic()]
+                if pending:
+                    remaining = min(remaining, min(pending) - monotonic())
+                if self.woken:
+                    self.woken = False
+                    return False
+                self.condition.wait(max(remaining, 0))
+            return True
+
+    def wakeup(self):
+        with self.condition:
+            self.woken = True
+            self.condition.notify_all()
+
+    def reset_input_buffer(self):
+        with self.condition:
+            now = monotonic()
+            self.frames = [f for f in self.frames if f[0] > now]
+
+    def reset_output_buffer(self):
+        pass